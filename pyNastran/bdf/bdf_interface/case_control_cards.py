@@ -1,12 +1,16 @@
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+
 #from .subcase_cards_check import
 from .subcase.cards import (
     GROUNDCHECK, EXTSEOUT, WEIGHTCHECK, DSAPRT, MEFFMASS,
     MODCON, SET, SETMC, SUPER, SEALL, SEDR, HARMONICS, AEROF, APRES,
-    CSCALE, GPKE, GPRSORT, GPSDCON, GPSTRESS, OFREQUENCY, OMODES, SURFACE, VOLUME,
+    CSCALE, GPKE, GPRSORT, OFREQUENCY, SURFACE, VOLUME,
 )
 from .subcase.cards_str import (
     AECONFIG, ANALYSIS, AUTOSPC, AESYMXY, AESYMXZ, AXISYMMETRIC,
-    DSYM, ECHO, SEQDEP, K2PP, THERMAL, RIGID,
+    DSYM, ECHO, SEQDEP, K2PP, RIGID,
 )
 from .subcase.cards_int import (
     ADACT, ADAPT, AUXMODEL,
@@ -157,7 +161,6 @@ CLASS_MAP = {
     'DSYM' : DSYM,
     'SEQDEP' : SEQDEP,
     'K2PP' : K2PP,
-    'THERMAL' : THERMAL,
     'RIGID' : RIGID,
 
     #  other??
@@ -166,16 +169,12 @@ CLASS_MAP = {
     'SEDR' : SEDR,
 
     'HARMONICS' : HARMONICS,
-    'ADACT' : ADACT,
     'AEROF' : AEROF,
     'APRES' : APRES,
 
     'CSCALE' : CSCALE,
     'GPKE' : GPKE,
     'GPRSORT' : GPRSORT,
-    'GPSDCON' : GPSDCON,
-    'GPSTRESS' : GPSTRESS,
-    'OFREQUENCY' : OFREQUENCY,
     'SURFACE' : SURFACE,
     'VOLUME' : VOLUME,
 
@@ -192,15 +191,41 @@ CLASS_MAP = {
     #'SURFACE' : SURFACE,
 }
 
-CLASS_MAP2 = {}
-CLASS_MAP_NAMES = []
-for name, card in CLASS_MAP.items():
-    CLASS_MAP2[name] = card
-    CLASS_MAP_NAMES.append(name)
-    if hasattr(card, 'alternate_names'):
+def _iter_class_map(class_map):
+    """yields the (interned name, card) pairs including the alternate names"""
+    for name, card in class_map.items():
+        yield sys.intern(name), card
         for namei in card.alternate_names:
-            CLASS_MAP2[namei] = card
-            CLASS_MAP_NAMES.append(namei)
-CLASS_MAP = CLASS_MAP2
-CLASS_MAP_NAMES = tuple(CLASS_MAP_NAMES)
-del CLASS_MAP2
+            yield sys.intern(namei), card
+
+
+def _build_class_map(class_map) -> tuple[MappingProxyType, tuple[str, ...]]:
+    """
+    Builds the read-only card map and the card names, which include the
+    alternate names (e.g., DISP).  The keys are interned, so a lookup with
+    an interned name is a pointer compare.
+    """
+    names = tuple(name for name, unused_card in _iter_class_map(class_map))
+    return MappingProxyType(dict(_iter_class_map(class_map))), names
+
+CLASS_MAP, CLASS_MAP_NAMES = _build_class_map(CLASS_MAP)
+# for dispatching on undecoded names (e.g., an HDF5 attribute)
+CLASS_MAP_BYTES = MappingProxyType({
+    name.encode('ascii'): card for name, card in CLASS_MAP.items()})
+
+
+@lru_cache(maxsize=256)
+def canonical(name: str) -> str:
+    """gets the stripped, upper case, interned form of a card name"""
+    return sys.intern(name.strip().upper())
+
+
+def get_card_class(name: str):
+    """
+    Gets the case control card class for a card name
+
+    The CLASS_MAP keys are interned.  Indexing CLASS_MAP directly with a
+    name that was sliced out of a line falls back to a full string compare,
+    so go through this (or canonical) to get the pointer compare.
+    """
+    return CLASS_MAP[canonical(name)]
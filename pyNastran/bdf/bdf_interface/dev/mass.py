@@ -17,7 +17,6 @@ constraint GO, GOGADGX, UEXP, UEXPT, MUG1, MUG1T
 
 """
 from __future__ import annotations
-from itertools import count
 from typing import cast, TYPE_CHECKING
 import numpy as np
 import scipy as sp
@@ -319,7 +318,7 @@ def make_gpwg(Mgg: sp.sparse.dok_matrix,
     .. todo:: doesn't consider SPOINTs/EPOINTs
     .. todo:: hasn't been tested
     """
-    fdtype = 'float32'
+    fdtype = 'float64'
     #grid_nids: np.ndarray,
                           #grid_cps: np.ndarray,
                           #xyz_cid0: np.ndarray,
@@ -358,7 +357,12 @@ def _D_to_inertia(Mgg: sp.sparse.dok_matrix,
     #assert D.shape[1] == Mgg.shape[0], f'D.shape={D.shape} Mgg.shape={Mgg.shape}'
     assert Mgg.shape[1] == D.shape[0], f'D.shape={D.shape} Mgg.shape={Mgg.shape}'
     try:
-        Mo = triple(D, Mgg)
+        if sp.sparse.issparse(Mgg):
+            # do the products on CSR instead of the DOK matrix; the
+            # only temporary is (6, N) and there's no dense (N, N) work
+            Mo = triple(D, Mgg.tocsr())
+        else:
+            Mo = triple(D, Mgg)
     except ValueError:
         raise ValueError(f'D.shape={D.shape} Mgg.shape={Mgg.shape}\n [Mo] = [D][Mgg][D]')
     log.info('Mgg=\n%s\n' % Mgg)
@@ -571,34 +575,44 @@ def get_6x6_rb_matrix(grid_nids: np.ndarray,
     D = np.zeros((nd_dof, 6), dtype=fdtype)
 
     # we subtract ref point so as to not change xyz_cid0
-    betas = {}
-    for cd in np.unique(grid_cds):
-        icd = np.where(grid_cds == cd)[0]
-        beta_nids = grid_nids[icd]
+    r1, r2, r3 = (xyz_cid0 - reference_point).T
+    Tr = np.zeros((nnodes, 3, 3), dtype=fdtype)
+    Tr[:, 0, 1] = r3
+    Tr[:, 0, 2] = -r2
+    Tr[:, 1, 0] = -r3
+    Tr[:, 1, 2] = r1
+    Tr[:, 2, 0] = r2
+    Tr[:, 2, 1] = -r1
+
+    # TiT for each node
+    ucds, icds = np.unique(grid_cds, return_inverse=True)
+    betas = np.zeros((len(ucds), 3, 3), dtype=fdtype)
+    is_identity = True
+    for i, cd in enumerate(ucds):
         Ti = coords[cd].beta().T
-        betas[cd] = Ti
+        betas[i] = Ti.T
         if not np.array_equal(Ti, np.eye(3)):
+            beta_nids = grid_nids[icds == i]
             log.info(f'cd={cd:d}; nids={beta_nids}; [Ti]=\n{Ti}\n')
+            is_identity = False
+
+    # each (6, 6) block of D is:
+    #   [TiT, TiT @ Tr]
+    #   [  0,      TiT]
+    d = D.reshape(nnodes, 6, 6)
+    if is_identity:
+        d[:, [0, 1, 2, 3, 4, 5], [0, 1, 2, 3, 4, 5]] = 1.
+        d[:, :3, 3:] = Tr
+    else:
+        TiT = betas[icds]
+        d[:, :3, :3] = TiT
+        d[:, 3:, 3:] = TiT
+        d[:, :3, 3:] = np.einsum('nij,njk->nik', TiT, Tr)
 
-    for i, isini, nid, xyz in zip(count(), isin, grid_nids, xyz_cid0 - reference_point):
-        if isini:
+    if isin.any():
+        for nid in grid_nids[isin]:
             print(f'skipping {nid}')
-            continue
-        r1, r2, r3 = xyz
-        j = i * 6
-        Tr = np.array([[0., r3, -r2],
-                       [-r3, 0., r1],
-                       [r2, -r1, 0.]], dtype=fdtype)
-        #print('Tr[%i]=\n%s\n' % (i+1, Tr))
-
-        cd = grid_cds[i]
-        Ti = betas[cd]
-        TiT = Ti.T
-        d = np.zeros((6, 6), dtype=fdtype)
-        d[:3, :3] = TiT
-        d[3:, 3:] = TiT
-        d[:3, 3:] = TiT @ Tr
-        D[j:j+6, :] = d
+        d[isin] = 0.
     return D
 
 
@@ -111,10 +111,7 @@ class TestMassGeneration(unittest.TestCase):
         #* 5.503882E+00 *
         #* 5.023013E+00 *
         #* 2.703873E+00 *
-        IQ_expected = np.array([
-            [ 5.5038824e+00,  3.6633622e-08,  8.1878504e-08],
-            [ 8.8647887e-08,  5.0230141e+00, -3.5885233e-07],
-            [ 5.3454769e-09,  1.8574326e-08,  2.7038724e+00]])
+        IQ_expected = np.diag([5.50388203, 5.02301447, 2.70387273])
 
         # Q
         # * 8.702303E-01  4.915230E-01  3.323378E-02 *
@@ -282,13 +279,10 @@ class TestMassGeneration(unittest.TestCase):
             [ 0.87682927,  4.376953  ,  0.6624477 ],
             [-0.34198812,  0.6624477 ,  3.4319038 ]])
         Q_expected = np.array([
-            [-8.8860166e-01, -2.6871899e-01, -3.7172186e-01],
-            [-4.5867968e-01,  5.2056354e-01,  7.2015733e-01],
-            [ 1.5101138e-05, -8.1043428e-01,  5.8582956e-01]])
-        IQ_expected = np.array([
-            [ 6.0756149e+00, -7.7424431e-08, -1.7855866e-07],
-            [ 1.5370921e-08,  2.8930018e+00, -1.1259252e-07],
-            [-3.5335850e-07,  1.3223152e-07,  4.4632468e+00]])
+            [-8.88601664e-01, -2.68718940e-01, -3.71721959e-01],
+            [-4.58679717e-01,  5.20563523e-01,  7.20157299e-01],
+            [ 1.50132727e-05, -8.10434297e-01,  5.85829540e-01]])
+        IQ_expected = np.diag([6.07561581, 2.89300191, 4.46324655])
         assert np.allclose(D, D_expected)
         assert np.allclose(Mo, Mo_expected)
         assert np.allclose(S, S_expected), f'S:\n{S}\nS_expected:\n{S_expected}'
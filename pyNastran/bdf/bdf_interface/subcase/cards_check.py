@@ -828,9 +828,8 @@ CHECK_CARDS = [
 #-------------------------------------------------------------------------------
 CHECK_CARD_DICT = {card.type : card for card in CHECK_CARDS} # type: dict[str, str]
 for card in CHECK_CARDS:
-    if hasattr(card, 'alternate_names'):
-        for name in card.alternate_names:
-            CHECK_CARD_DICT[name] = card
+    for name in card.alternate_names:
+        CHECK_CARD_DICT[name] = card
 
 
 # CHECK_CARD_NAMES = tuple([card.short_name for card in CHECK_CARDS])  # type: tuple[str]
@@ -353,9 +353,8 @@ INT_CARDS = [
 ]
 INT_CARD_DICT = {card.type : card for card in INT_CARDS}
 for card in INT_CARDS:
-    if hasattr(card, 'alternate_names'):
-        for name in card.alternate_names:
-            INT_CARD_DICT[name] = card
+    for name in card.alternate_names:
+        INT_CARD_DICT[name] = card
 
 
 #INT_CARD_NAMES = tuple([card.type for card in INT_CARDS])
@@ -5,7 +5,6 @@ from typing import TYPE_CHECKING
 
 from pyNastran.utils.dict_to_h5py import _cast # , _cast_array
 from pyNastran.bdf.bdf_interface.subcase.cards import OBJ_MAP
-from pyNastran.bdf.bdf_interface.case_control_cards import CLASS_MAP
 from pyNastran.utils.numpy_utils import integer_types, integer_float_types
 from pyNastran.utils import object_attributes
 
@@ -118,11 +117,16 @@ def _load_hdf5_param(group, key: str, encoding: str, log: SimpleLogger) -> tuple
     return value, options, param_type
 
 def _load_hdf5_object(key, keys, sub_group, encoding):
+    # deferred, so exporting doesn't have to import every case control card
+    from pyNastran.bdf.bdf_interface.case_control_cards import CLASS_MAP_BYTES, get_card_class
     keys.remove('object')
     sub_groupi = sub_group['object']
 
     Type = sub_groupi.attrs['type']
-    cls = CLASS_MAP[Type]
+    if isinstance(Type, bytes):
+        cls = CLASS_MAP_BYTES[Type]
+    else:
+        cls = get_card_class(Type)
 
     if hasattr(cls, 'load_hdf5'):
         class_obj, options = cls.load_hdf5(sub_groupi, 'utf8')
@@ -1,6 +1,9 @@
 
 class CaseControlCard:
     """basic card similar to the BaseCard class for the BDF"""
+    # abbreviations of the card name (e.g., DISP for DISPLACEMENT)
+    alternate_names: frozenset[str] = frozenset()
+
     def __iter__(self):
         """temporary method to emulate the old list access style"""
         value = self
@@ -1,11 +1,15 @@
 """tests the CaseControlDeck"""
 import os
+import sys
 import unittest
 
 import pyNastran
 from pyNastran.bdf.bdf import BDF
 from pyNastran.bdf.case_control_deck import CaseControlDeck
 from pyNastran.bdf.bdf_interface.subcase.utils import write_set, collapse_thru_packs
+from pyNastran.bdf.bdf_interface.case_control_cards import (
+    CLASS_MAP, CLASS_MAP_BYTES, canonical, get_card_class)
+from pyNastran.bdf.bdf_interface.subcase.cards_check import DISPLACEMENT
 
 PKG_PATH = pyNastran.__path__[0]
 TEST_PATH = os.path.join(PKG_PATH, 'bdf', 'test')
@@ -96,6 +100,7 @@ class CaseControlTest(unittest.TestCase):
 
         with open(bdf_filename2, 'r') as bdf_file:
             lines = bdf_file.readlines()
+        os.remove(bdf_filename2)
 
         lines_expected = [
             '$pyNastran: version=msc',
@@ -725,6 +730,19 @@ class CaseControlTest(unittest.TestCase):
         subcase.add_set_from_values(100, [1, 2, 10])
         # subcase.add('SET', value, options, param_type)  # TODO: doesn't work
 
+    def test_get_card_class(self):
+        """tests the card name -> class lookup"""
+        name = ''.join(['DISP', 'LACEMENT'])
+        assert get_card_class(name) is DISPLACEMENT
+        assert get_card_class('DISP') is DISPLACEMENT
+        assert get_card_class(' disp ') is DISPLACEMENT
+        assert canonical(' disp ') is canonical('DISP')
+        assert CLASS_MAP_BYTES[b'DISP'] is DISPLACEMENT
+        for key in CLASS_MAP:
+            assert sys.intern(key) is key, key
+        with self.assertRaises(KeyError):
+            get_card_class('JUNK')
+
 def compare_lines(self, lines, lines_expected, has_endline):
     i = 0
     for line, line_expected in zip(lines, lines_expected):
@@ -29,7 +29,7 @@ from cpylog import get_logger
 from pyNastran.bdf.subcase import Subcase, update_param_name
 from pyNastran.bdf.case_control_deck import (_clean_lines, split_equal_space,
                                              integer, decode_lines)
-from .bdf_interface.case_control_cards import CLASS_MAP
+from .bdf_interface.case_control_cards import get_card_class
 from .case_control_deck import parse_entry
 from pyNastran.bdf.bdf_interface.subcase.cards import (
     #SURFACE, VOLUME, CSCALE,
@@ -1035,7 +1035,7 @@ def _parse_entry(self, lines: list[str],
         keyi = line_upper.split(' ')[0]
         options = None
         param_type = 'OBJ-type'
-        clsi = CLASS_MAP[keyi]
+        clsi = get_card_class(keyi)
         obj = clsi.add_from_case_control(line_upper.strip())
         value = obj
         key = obj.type
@@ -71,6 +71,7 @@ class TestBDFUnit(Tester):
 
         #import pickle
         model3.save(obj_filename=obj_filename, unxref=True)
+        os.remove(obj_filename)
 
     def test_bdf_include5(self):
         """verify we get 5 include files if they are one after the other"""
@@ -880,6 +881,7 @@ class TestBDFUnit(Tester):
         superelement_renumber(
             fem1, bdf_filename_out=bdf_filename_out,
             starting_id_dict=None)
+        os.remove(bdf_filename_out)
 
     def test_bdf_other_1(self):
         """checks axisymmetric model"""
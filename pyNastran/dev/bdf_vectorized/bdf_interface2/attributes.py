@@ -193,10 +193,10 @@ class BDFAttributes:
         self.celas4 = CELAS4(self)
         self.elements_spring = ElementsSpring(self)
 
-        self.celas1 = CDAMP1(self)
-        self.celas2 = CDAMP2(self)
-        self.celas3 = CDAMP3(self)
-        self.celas4 = CDAMP4(self)
+        self.cdamp1 = CDAMP1(self)
+        self.cdamp2 = CDAMP2(self)
+        self.cdamp3 = CDAMP3(self)
+        self.cdamp4 = CDAMP4(self)
 
         # rods/tubes
         self.prod = PROD(self)
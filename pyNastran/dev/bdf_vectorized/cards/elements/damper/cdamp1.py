@@ -1,6 +1,7 @@
 from numpy import array, zeros, unique, searchsorted, where, arange
 
 from pyNastran.dev.bdf_vectorized.cards.elements.damper.damp_element import DamperElement
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 
 from pyNastran.bdf.field_writer_8 import print_card_8
 from pyNastran.bdf.field_writer_16 import print_card_16
@@ -111,8 +112,9 @@ class CDAMP1(DamperElement):
         c1b = c1-1 if c1 > 0 else c1
         c2b = c2-1 if c2 > 0 else c2
 
-        i1 = index0s[n1]
-        i2 = index0s[n2]
+        in1, in2 = get_node_index(model.grid.node_id, [n1, n2])
+        i1 = index0s[in1]
+        i2 = index0s[in2]
         dofs = [
             i1 + c1b,
             i2 + c1b,
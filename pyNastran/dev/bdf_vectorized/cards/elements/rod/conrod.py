@@ -7,6 +7,7 @@ from pyNastran.bdf.field_writer_16 import print_card_16
 from pyNastran.bdf.bdf_interface.assign_type import integer, double, double_or_blank
 
 from pyNastran.dev.bdf_vectorized.cards.elements.rod.rod_element import RodElement
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 
 def _Lambda(v1, debug=True):
     """
@@ -319,11 +320,12 @@ class CONROD(RodElement):
 
         n1, n2 = self.node_ids[i, :]
 
-        i1 = index0s[n1]
-        i2 = index0s[n2]
+        in1, in2 = get_node_index(model.grid.node_id, [n1, n2])
+        i1 = index0s[in1]
+        i2 = index0s[in2]
 
-        xyz1 = positions[n1]
-        xyz2 = positions[n2]
+        xyz1 = positions[in1]
+        xyz2 = positions[in2]
         v1 = xyz1 - xyz2
         L = norm(v1)
         if L == 0.0:
@@ -353,6 +355,22 @@ class CONROD(RodElement):
         return(M, dofs, n_ijv)
 
     def get_stiffness_matrix(self, i, model, positions, index0s, knorm=1.0):  # CROD/CONROD
+        """
+        Gets the stiffness matrix of the i-th CONROD
+
+        Parameters
+        ----------
+        i : int
+            the element index
+        model : BDF
+            the BDF object
+        positions : (nnodes, 3) float ndarray
+            the node positions; positions[inode] = xyz
+        index0s : (nnodes, ) int ndarray
+            the DOF of component 1 of each node; index0s[inode] = dof
+        knorm : float; default=1.0
+            the normalization of K in the debug log
+        """
         #print("----------------")
         A = self.get_area_from_index(i)
         #mat = self.get_material_from_index(i)
@@ -373,11 +391,12 @@ class CONROD(RodElement):
         #(n1, n2) = self.node_ids
         n1, n2 = self.node_ids[i, :]
 
-        i1 = index0s[n1]
-        i2 = index0s[n2]
+        in1, in2 = get_node_index(model.grid.node_id, [n1, n2])
+        i1 = index0s[in1]
+        i2 = index0s[in2]
 
-        xyz1 = positions[n1]
-        xyz2 = positions[n2]
+        xyz1 = positions[in1]
+        xyz2 = positions[in2]
         #p1 = model.Node(n1).xyz
 
         dxyz12 = xyz1 - xyz2
@@ -465,128 +484,19 @@ class CONROD(RodElement):
 
         return(K2, dofs, n_ijv)
 
+    def get_stiffness_matrices(self, model, positions, dofs):
+        mat1 = self.model.materials.mat1
+        imid = mat1.get_material_index_by_material_id(self.material_id)
+        E = mat1.E[imid]
+        G = mat1.G[imid]
+        return self._get_stiffness_matrices(positions, dofs, self.A, E, G, self.J)
+
     def displacement_stress(self, model, positions, q, dofs):
-        n = self.n
-        o1 = np.zeros(n, 'float64')
-        e1 = np.zeros(n, 'float64')
-        f1 = np.zeros(n, 'float64')
-
-        o4 = np.zeros(n, 'float64')
-        e4 = np.zeros(n, 'float64')
-        f4 = np.zeros(n, 'float64')
-
-        for i in range(n):
-            J = self.J[i]
-            C = self.c[i]
-            n1, n2 = self.node_ids[i, :]
-
-
-            xyz1 = positions[n1]
-            xyz2 = positions[n2]
-
-            v1 = xyz1 - xyz2
-            L = norm(xyz1 - xyz2)
-            if L == 0.0:
-                msg = 'invalid CONROD length=0.0\n%s' % (self.__repr__())
-                raise ZeroDivisionError(msg)
-
-            A = self.get_area_from_index(i)
-            mid = self.material_id[i]
-            #mat = self.model.materials.mat1[mid]
-            imid = self.model.materials.mat1.get_material_index_by_material_id(mid)
-            mat = self.model.materials.mat1[imid]
-
-            E = mat.E
-            G = mat.G
-            #========================
-            #mat = self.get_material_from_index(i)
-            #jmat = searchsorted(mat.material_id, self.material_id[i])
-
-            #E = mat.E[jmat]
-            #G = mat.G[jmat]
-            #G = self.G()
-
-            #print("A=%g E=%g G=%g J=%g L=%g" % (A, E, G, J, L))
-            k_axial = A * E / L
-            k_torsion = G * J / L
-
-            #k = array([[1., -1.],
-                       #[-1., 1.]])  # 1D rod
-
-            Lambda = _Lambda(v1, debug=False)
-
-            #print("**dofs =", dofs)
-            n11 = dofs[(n1, 1)]
-            n21 = dofs[(n2, 1)]
-
-            n12 = dofs[(n1, 2)]
-            n22 = dofs[(n2, 2)]
-
-            n13 = dofs[(n1, 3)]
-            n23 = dofs[(n2, 3)]
-
-            # moments
-            n14 = dofs[(n1, 4)]
-            n24 = dofs[(n2, 4)]
-
-            n15 = dofs[(n1, 5)]
-            n25 = dofs[(n2, 5)]
-
-            n16 = dofs[(n1, 6)]
-            n26 = dofs[(n2, 6)]
-
-            q_axial = np.array([
-                q[n11], q[n12], q[n13],
-                q[n21], q[n22], q[n23]
-            ])
-            q_torsion = np.array([
-                q[n14], q[n15], q[n16],
-                q[n24], q[n25], q[n26]
-            ])
-            #print("type=%s n1=%s n2=%s" % (self.type, n1, n2))
-            #print("n11=%s n12=%s n21=%s n22=%s" %(n11,n12,n21,n22))
-
-            #print("q2[%s] = %s" % (self.eid, q2))
-            #print("Lambda = \n"+str(Lambda))
-
-            #print("Lsize = ",Lambda.shape)
-            #print("qsize = ",q.shape)
-            u_axial = np.array(Lambda) @ q_axial
-            du_axial = u_axial[0] - u_axial[1]
-            u_torsion = np.array(Lambda) @ q_torsion
-            du_torsion = u_torsion[0] - u_torsion[1]
-
-            #L = self.Length()
-            #E = self.E()
-            #A = self.Area()
-
-            #C = self.C()
-            #J = self.J()
-            #G = self.G()
-
-            axial_strain = du_axial / L
-            torsional_strain = du_torsion * C / L
-
-            axial_stress = E * axial_strain
-            torsional_stress = G * torsional_strain
-
-            axial_force = axial_stress * A
-            torsional_moment = du_torsion * G * J / L
-            #print("axial_strain = %s [psi]" % axial_strain)
-            #print("axial_stress = %s [psi]" % axial_stress)
-            #print("axial_force  = %s [lb]\n" % axial_force)
-            o1[i] = axial_stress
-            o4[i] = torsional_stress
-
-            e1[i] = axial_strain
-            e4[i] = torsional_strain
-
-            f1[i] = axial_force
-            f4[i] = torsional_moment
-
-        return (e1, e4,
-                o1, o4,
-                f1, f4)
+        mat1 = self.model.materials.mat1
+        imid = mat1.get_material_index_by_material_id(self.material_id)
+        E = mat1.E[imid]
+        G = mat1.G[imid]
+        return self._displacement_stress(positions, q, dofs, self.A, E, G, self.J, self.c)
 
     def slice_by_index(self, i):
         i = self._validate_slice(i)
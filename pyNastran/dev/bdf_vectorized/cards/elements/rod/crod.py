@@ -3,6 +3,7 @@ from numpy import array, dot, arange, zeros, unique, searchsorted, transpose, in
 from numpy.linalg import norm  # type: ignore
 
 from pyNastran.dev.bdf_vectorized.cards.elements.rod.conrod import _Lambda
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 from pyNastran.utils.dev import list_print
 
 from pyNastran.bdf.field_writer_8 import print_card_8
@@ -300,11 +301,12 @@ class CROD(RodElement):
         else:
             n1, n2 = self.node_ids[i, :]
 
-        i1 = index0s[n1]
-        i2 = index0s[n2]
+        in1, in2 = get_node_index(model.grid.node_id, [n1, n2])
+        i1 = index0s[in1]
+        i2 = index0s[in2]
 
-        xyz1 = positions[n1]
-        xyz2 = positions[n2]
+        xyz1 = positions[in1]
+        xyz2 = positions[in2]
         v1 = xyz1 - xyz2
         L = norm(v1)
         if L == 0.0:
@@ -337,9 +339,24 @@ class CROD(RodElement):
 
     #=========================================================================
     def get_stiffness_matrix(self, i, model, positions, index0s, knorm=1.0):
+        """
+        Gets the stiffness matrix of the i-th CROD
+
+        Parameters
+        ----------
+        i : int
+            the element index
+        model : BDF
+            the BDF object
+        positions : (nnodes, 3) float ndarray
+            the node positions; positions[inode] = xyz
+        index0s : (nnodes, ) int ndarray
+            the DOF of component 1 of each node; index0s[inode] = dof
+        knorm : float; default=1.0
+            the normalization of K in the debug log
+        """
         #print("----------------")
         pid = self.property_id[i]
-        assert isinstance(pid, int), pid
         element_id = self.element_id[i]
         i = self.get_element_index_by_element_id(element_id)
         A = self.get_area_by_element_index(i)
@@ -358,11 +375,12 @@ class CROD(RodElement):
         nids = self.node_ids[i, :]
         n1, n2 = nids.squeeze()
 
-        i1 = index0s[n1]
-        i2 = index0s[n2]
+        in1, in2 = get_node_index(model.grid.node_id, [n1, n2])
+        i1 = index0s[in1]
+        i2 = index0s[in2]
 
-        xyz1 = positions[n1]
-        xyz2 = positions[n2]
+        xyz1 = positions[in1]
+        xyz2 = positions[in2]
         #p1 = model.Node(n1).xyz
 
         dxyz12 = xyz1 - xyz2
@@ -450,140 +468,22 @@ class CROD(RodElement):
 
         return(K2, dofs, n_ijv)
 
-    def displacement_stress(self, model, positions, q, dofs):
-        n = self.n
-        o1 = zeros(n, 'float64')
-        e1 = zeros(n, 'float64')
-        f1 = zeros(n, 'float64')
-
-        o4 = zeros(n, 'float64')
-        e4 = zeros(n, 'float64')
-        f4 = zeros(n, 'float64')
-
-
-        #As = self.get_area_by_element_id(self.property_id)
-        #Es = self.get_E_by_element_id(self.property_id)
-        #Gs = self.get_G_by_element_id(self.property_id)
-        #Js = self.get_J_by_element_id(self.property_id)
-        #Cs = self.get_c_by_element_id(self.property_id)
+    def get_stiffness_matrices(self, model, positions, dofs):
+        i = self.get_element_index_by_element_id(self.element_id)
+        As = self.get_area_by_element_index(i)
+        Gs = self.model.prod.get_G_by_property_id(self.property_id)
+        Es = self.model.prod.get_E_by_property_id(self.property_id)
+        Js = self.model.prod.get_J_by_property_id(self.property_id)
+        return self._get_stiffness_matrices(positions, dofs, As, Es, Gs, Js)
 
+    def displacement_stress(self, model, positions, q, dofs):
         i = self.get_element_index_by_element_id(self.element_id)
         As = self.get_area_by_element_index(i)
         Gs = self.model.prod.get_G_by_property_id(self.property_id)
         Es = self.model.prod.get_E_by_property_id(self.property_id)
         Js = self.model.prod.get_J_by_property_id(self.property_id)
         Cs = self.model.prod.get_c_by_property_id(self.property_id)
-
-        for i in range(n):
-            A = As[i]
-            E = Es[i]
-            G = Gs[i]
-            E = Es[i]
-            J = Js[i]
-            C = Cs[i]
-            n1, n2 = self.node_ids[i, :]
-
-
-            xyz1 = positions[n1]
-            xyz2 = positions[n2]
-
-            v1 = xyz1 - xyz2
-            L = norm(xyz1 - xyz2)
-            if L == 0.0:
-                msg = 'invalid CROD length=0.0\n%s' % (self.__repr__())
-                raise ZeroDivisionError(msg)
-
-            #========================
-            #mat = self.get_material_from_index(i)
-            #jmat = searchsorted(mat.material_id, self.material_id[i])
-
-            #E = mat.E[jmat]
-            #G = mat.G[jmat]
-            #G = self.G()
-
-            #print("A=%g E=%g G=%g J=%g L=%g" % (A, E, G, J, L))
-            #k_axial = A * E / L
-            #k_torsion = G * J / L
-            #k_axial = 1.0
-            #k_torsion = 2.0
-
-            #k = array([[1., -1.],
-                       #[-1., 1.]])  # 1D rod
-
-            Lambda = _Lambda(v1, debug=False)
-
-            #print("**dofs =", dofs)
-            n11 = dofs[(n1, 1)]
-            n21 = dofs[(n2, 1)]
-
-            n12 = dofs[(n1, 2)]
-            n22 = dofs[(n2, 2)]
-
-            n13 = dofs[(n1, 3)]
-            n23 = dofs[(n2, 3)]
-
-            # moments
-            n14 = dofs[(n1, 4)]
-            n24 = dofs[(n2, 4)]
-
-            n15 = dofs[(n1, 5)]
-            n25 = dofs[(n2, 5)]
-
-            n16 = dofs[(n1, 6)]
-            n26 = dofs[(n2, 6)]
-
-            q_axial = array([
-                q[n11], q[n12], q[n13],
-                q[n21], q[n22], q[n23]
-            ])
-            q_torsion = array([
-                q[n14], q[n15], q[n16],
-                q[n24], q[n25], q[n26]
-            ])
-            #print("type=%s n1=%s n2=%s" % (self.type, n1, n2))
-            #print("n11=%s n12=%s n21=%s n22=%s" %(n11,n12,n21,n22))
-
-            #print("q2[%s] = %s" % (self.eid, q2))
-            #print("Lambda = \n"+str(Lambda))
-
-            #print("Lsize = ", Lambda.shape)
-            #print("qsize = ", q.shape)
-            u_axial = array(Lambda) @ q_axial
-            du_axial = u_axial[0] - u_axial[1]
-            u_torsion = array(Lambda) @ q_torsion
-            du_torsion = u_torsion[0] - u_torsion[1]
-
-            #L = self.Length()
-            #E = self.E()
-            #A = self.area()
-
-            #C = self.C()
-            #J = self.J()
-            #G = self.G()
-
-            axial_strain = du_axial / L
-            torsional_strain = du_torsion * C / L
-
-            axial_stress = E * axial_strain
-            torsional_stress = G * torsional_strain
-
-            axial_force = axial_stress * A
-            torsional_moment = du_torsion * G * J / L
-            #print("axial_strain = %s [psi]" % axial_strain)
-            #print("axial_stress = %s [psi]" % axial_stress)
-            #print("axial_force  = %s [lb]\n" % axial_force)
-            o1[i] = axial_stress
-            o4[i] = torsional_stress
-
-            e1[i] = axial_strain
-            e4[i] = torsional_strain
-
-            f1[i] = axial_force
-            f4[i] = torsional_moment
-
-        return (e1, e4,
-                o1, o4,
-                f1, f4)
+        return self._displacement_stress(positions, q, dofs, As, Es, Gs, Js, Cs)
 
     def slice_by_index(self, i):
         i = self._validate_slice(i)
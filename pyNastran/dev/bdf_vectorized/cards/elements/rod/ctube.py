@@ -2,6 +2,7 @@ from numpy import array, dot, arange, zeros, unique, searchsorted, transpose, in
 from numpy.linalg import norm  # type: ignore
 
 from pyNastran.dev.bdf_vectorized.cards.elements.rod.conrod import _Lambda
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 from pyNastran.utils.numpy_utils import integer_types
 from pyNastran.utils.dev import list_print
 
@@ -292,11 +293,12 @@ class CTUBE(RodElement):
         else:
             n1, n2 = self.node_ids[i, :]
 
-        i1 = index0s[n1]
-        i2 = index0s[n2]
+        in1, in2 = get_node_index(model.grid.node_id, [n1, n2])
+        i1 = index0s[in1]
+        i2 = index0s[in2]
 
-        p1 = positions[n1]
-        p2 = positions[n2]
+        p1 = positions[in1]
+        p2 = positions[in2]
         v1 = p1 - p2
         L = norm(v1)
         if L == 0.0:
@@ -347,13 +349,28 @@ class CTUBE(RodElement):
 
     #=========================================================================
     def get_stiffness_matrix(self, i, model, positions, index0s, knorm=1.0):
+        """
+        Gets the stiffness matrix of the i-th CTUBE
+
+        Parameters
+        ----------
+        i : int
+            the element index
+        model : BDF
+            the BDF object
+        positions : (nnodes, 3) float ndarray
+            the node positions; positions[inode] = xyz
+        index0s : (nnodes, ) int ndarray
+            the DOF of component 1 of each node; index0s[inode] = dof
+        knorm : float; default=1.0
+            the normalization of K in the debug log
+        """
         #print("----------------")
-        pid = self.property_id[i]
-        assert isinstance(pid, int), pid
-        A = self.get_area_by_element_id(pid)
-        E = self.get_E_by_element_id(pid)
-        G = self.get_G_by_element_id(pid)
-        J = self.get_J_by_element_id(pid)
+        element_id = self.element_id[i]
+        A = self.get_area_by_element_id(element_id)
+        E = self.get_E_by_element_id(element_id)
+        G = self.get_G_by_element_id(element_id)
+        J = self.get_J_by_element_id(element_id)
         #print('A=%s E=%s G=%s J=%s' % (A, E, G, J))
 
         #========================
@@ -361,13 +378,14 @@ class CTUBE(RodElement):
         n1 = self.node_ids[i, 0]
         n2 = self.node_ids[i, 1]
 
-        i1 = index0s[n1]
-        i2 = index0s[n2]
+        in1, in2 = get_node_index(model.grid.node_id, [n1, n2])
+        i1 = index0s[in1]
+        i2 = index0s[in2]
 
         #print("n0", n0)
         #print("n1", n1)
-        n1 = positions[n1]
-        n2 = positions[n2]
+        n1 = positions[in1]
+        n2 = positions[in2]
         #p1 = model.Node(n1).xyz
 
         v1 = n1 - n2
@@ -385,7 +403,7 @@ class CTUBE(RodElement):
         k = array([[1., -1.],
                    [-1., 1.]])  # 1D rod
 
-        Lambda = _Lambda(v1, debug=True)
+        Lambda = _Lambda(v1, debug=False)
         K = Lambda.T @ k @ Lambda
         Ki, Kj = K.shape
 
@@ -458,132 +476,20 @@ class CTUBE(RodElement):
 
         return(K2, dofs, n_ijv)
 
-    def displacement_stress(self, model, positions, q, dofs):
-        n = self.n
-        o1 = zeros(n, 'float64')
-        e1 = zeros(n, 'float64')
-        f1 = zeros(n, 'float64')
-
-        o4 = zeros(n, 'float64')
-        e4 = zeros(n, 'float64')
-        f4 = zeros(n, 'float64')
-
-
-        As = self.get_area_by_element_id(self.property_id)
-        Es = self.get_E_by_element_id(self.property_id)
-        Gs = self.get_G_by_element_id(self.property_id)
-        Js = self.get_J_by_element_id(self.property_id)
-        Cs = self.get_c_by_element_id(self.property_id)
-
-        for i in range(n):
-            A = As[i]
-            E = Es[i]
-            G = Gs[i]
-            E = Es[i]
-            J = Js[i]
-            C = Cs[i]
-            n1, n2 = self.node_ids[i, :]
-
-
-            p1 = positions[n1]
-            p2 = positions[n2]
-
-            v1 = p1 - p2
-            L = norm(p1 - p2)
-            if L == 0.0:
-                msg = 'invalid CTUBE length=0.0\n%s' % (self.__repr__())
-                raise ZeroDivisionError(msg)
-
-            #========================
-            #mat = self.get_material_from_index(i)
-            #jmat = searchsorted(mat.material_id, self.material_id[i])
-
-            #E = mat.E[jmat]
-            #G = mat.G[jmat]
-            #G = self.G()
-
-            #print("A=%g E=%g G=%g J=%g L=%g" % (A, E, G, J, L))
-            #k_axial = A * E / L
-            #k_torsion = G * J / L
-            #k_axial = 1.0
-            #k_torsion = 2.0
-
-            #k = array([[1., -1.], [-1., 1.]])  # 1D rod
-
-            Lambda = _Lambda(v1, debug=False)
+    def get_stiffness_matrices(self, model, positions, dofs):
+        As = self.get_area_by_element_id(self.element_id)
+        Es = self.get_E_by_element_id(self.element_id)
+        Gs = self.get_G_by_element_id(self.element_id)
+        Js = self.get_J_by_element_id(self.element_id)
+        return self._get_stiffness_matrices(positions, dofs, As, Es, Gs, Js)
 
-            #print("**dofs =", dofs)
-            n11 = dofs[(n1, 1)]
-            n21 = dofs[(n2, 1)]
-
-            n12 = dofs[(n1, 2)]
-            n22 = dofs[(n2, 2)]
-
-            n13 = dofs[(n1, 3)]
-            n23 = dofs[(n2, 3)]
-
-            # moments
-            n14 = dofs[(n1, 4)]
-            n24 = dofs[(n2, 4)]
-
-            n15 = dofs[(n1, 5)]
-            n25 = dofs[(n2, 5)]
-
-            n16 = dofs[(n1, 6)]
-            n26 = dofs[(n2, 6)]
-
-            q_axial = array([
-                q[n11], q[n12], q[n13],
-                q[n21], q[n22], q[n23]
-            ])
-            q_torsion = array([
-                q[n14], q[n15], q[n16],
-                q[n24], q[n25], q[n26]
-            ])
-            #print("type=%s n1=%s n2=%s" % (self.type, n1, n2))
-            #print("n11=%s n12=%s n21=%s n22=%s" %(n11,n12,n21,n22))
-
-            #print("q2[%s] = %s" % (self.eid, q2))
-            #print("Lambda = \n"+str(Lambda))
-
-            #print("Lsize = ", Lambda.shape)
-            #print("qsize = ", q.shape)
-            u_axial = array(Lambda) @ q_axial
-            du_axial = -u_axial[0] + u_axial[1]
-            u_torsion = array(Lambda) @ q_torsion
-            du_torsion = -u_torsion[0] + u_torsion[1]
-
-            #L = self.Length()
-            #E = self.E()
-            #A = self.area()
-
-            #C = self.C()
-            #J = self.J()
-            #G = self.G()
-
-            axial_strain = du_axial / L
-            torsional_strain = du_torsion * C / L
-
-            axial_stress = E * axial_strain
-            torsional_stress = G * torsional_strain
-
-            axial_force = axial_stress * A
-            torsional_moment = du_torsion * G * J / L
-            #print("axial_strain = %s [psi]" % axial_strain)
-            #print("axial_stress = %s [psi]" % axial_stress)
-            #print("axial_force  = %s [lb]\n" % axial_force)
-            o1[i] = axial_stress
-            o4[i] = torsional_stress
-
-            e1[i] = axial_strain
-            e4[i] = torsional_strain
-
-            f1[i] = axial_force
-            f4[i] = torsional_moment
-
-        return (e1, e4,
-                o1, o4,
-                f1, f4)
+    def displacement_stress(self, model, positions, q, dofs):
+        As = self.get_area_by_element_id(self.element_id)
+        Es = self.get_E_by_element_id(self.element_id)
+        Gs = self.get_G_by_element_id(self.element_id)
+        Js = self.get_J_by_element_id(self.element_id)
+        Cs = self.get_c_by_element_id(self.element_id)
+        return self._displacement_stress(positions, q, dofs, As, Es, Gs, Js, Cs)
 
     def slice_by_index(self, i):
         i = self._validate_slice(i)
@@ -23,17 +23,19 @@ class PTUBE(Property):
         """
         Property.__init__(self, model)
 
-    def allocate(self, ncards):
-        self.n = ncards
-        self.model.log.debug('%s ncards=%s' % (self.type, ncards))
-        float_fmt = self.model.float_fmt
-        #: Property ID
-        self.property_id = zeros(ncards, 'int32')
-        self.material_id = zeros(ncards, 'int32')
-
-        self.OD = zeros((ncards, 2), float_fmt)
-        self.t = zeros(ncards, float_fmt)
-        self.nsm = zeros(ncards, float_fmt)
+    def allocate(self, card_count):
+        ncards = card_count[self.type]
+        if ncards:
+            self.n = ncards
+            self.model.log.debug('%s ncards=%s' % (self.type, ncards))
+            float_fmt = self.model.float_fmt
+            #: Property ID
+            self.property_id = zeros(ncards, 'int32')
+            self.material_id = zeros(ncards, 'int32')
+
+            self.OD = zeros((ncards, 2), float_fmt)
+            self.t = zeros(ncards, float_fmt)
+            self.nsm = zeros(ncards, float_fmt)
 
     def add_card(self, card, comment=''):
         self.model.log.debug('n=%s i=%s' % (self.n, self.i))
@@ -113,7 +115,7 @@ class PTUBE(Property):
         Dout = self.OD[i, 0]
         if self.t[i] == 0:
             return pi / 4. * Dout**2
-        Din = Dout - 2 * self.t
+        Din = Dout - 2 * self.t[i]
         A1 = pi / 4. * (Dout * Dout - Din * Din)
         return A1
 
@@ -122,7 +124,7 @@ class PTUBE(Property):
         Dout = self.OD[i, 1]
         if self.t[i] == 0:
             return pi / 4. * Dout**2
-        Din = Dout - 2 * self.t
+        Din = Dout - 2 * self.t[i]
         A2 = pi / 4. * (Dout * Dout - Din * Din)
         return A2
 
@@ -166,7 +168,7 @@ class PTUBE(Property):
 
     def _Ji(self, i):
         Dout = self.OD[i, 0]
-        if self.t[0] == 0.0:
+        if self.t[i] == 0.0:
             return pi / 8. * Dout**4
         Din = Dout - 2 * self.t[i]
         return pi / 8. * (Dout**4 - Din**2)
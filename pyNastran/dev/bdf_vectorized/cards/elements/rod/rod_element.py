@@ -1,4 +1,8 @@
+import numpy as np
+from numpy.linalg import norm  # type: ignore
+
 from pyNastran.dev.bdf_vectorized.cards.elements.element import Element
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 
 class RodElement(Element):
     def __init__(self, model):
@@ -11,3 +15,106 @@ class RodElement(Element):
            the BDF object
         """
         Element.__init__(self, model)
+
+    def _get_stiffness_matrices(self, positions, dofs, A, E, G, J):
+        """
+        Gets the stiffness matrices for all the rods in one pass
+
+        Parameters
+        ----------
+        positions : (nnodes, 3) float ndarray
+            the node positions; positions[inode] = xyz
+        dofs : (nnodes, 7) int ndarray
+            the DOF map; dofs[inode, 0] = nid; dofs[inode, component] = dof
+        A, E, G, J : (n, ) float ndarray
+            the area, moduli and torsional constant of each rod
+
+        Returns
+        -------
+        K : (n, 12, 12) float ndarray
+            the axial (first 6 dofs) and torsional (last 6 dofs)
+            stiffness matrices
+        element_dofs : (n, 12) int ndarray
+            the global DOFs of K; [n1 T123, n2 T123, n1 R123, n2 R123]
+
+        """
+        n1, n2 = get_node_index(self.model.grid.node_id, self.node_ids).T
+        v1 = positions[n1, :] - positions[n2, :]
+        L = norm(v1, axis=1)
+        izero = np.flatnonzero(L == 0.0)
+        if len(izero):
+            msg = 'invalid %s length=0.0; element_id=%s\n%s' % (
+                self.type, self.element_id[izero], self.__repr__())
+            raise ZeroDivisionError(msg)
+        unit = v1 / L[:, np.newaxis]
+        k_axial = A * E / L
+        k_torsion = G * J / L
+
+        # [Lambda]^T [k] [Lambda] for k = [[1, -1], [-1, 1]]
+        k = np.array([[1., -1.],
+                      [-1., 1.]])
+        uu = np.einsum('ni,nj->nij', unit, unit)
+        nrods = len(L)
+        K1 = np.einsum('ab,nij->naibj', k, uu).reshape(nrods, 6, 6)
+
+        K = np.zeros((nrods, 12, 12), dtype='float64')
+        K[:, :6, :6] = k_axial[:, np.newaxis, np.newaxis] * K1
+        K[:, 6:, 6:] = k_torsion[:, np.newaxis, np.newaxis] * K1
+        i1, i2 = get_node_index(dofs[:, 0], self.node_ids).T
+        element_dofs = np.hstack([
+            dofs[i1, 1:4], dofs[i2, 1:4],
+            dofs[i1, 4:7], dofs[i2, 4:7],
+        ])
+        return K, element_dofs
+
+    def _displacement_stress(self, positions, q, dofs, A, E, G, J, C):
+        """
+        Gets the axial/torsional strain, stress and force for all the rods
+        in one pass
+
+        Parameters
+        ----------
+        positions : (nnodes, 3) float ndarray
+            the node positions; positions[inode] = xyz
+        q : (ndofs, ) float ndarray
+            the displacements
+        dofs : (nnodes, 7) int ndarray
+            the DOF map; dofs[inode, 0] = nid; dofs[inode, component] = dof
+        A, E, G, J, C : (n, ) float ndarray
+            the area, moduli, torsional constant and torsional stress
+            recovery coefficient of each rod
+
+        Returns
+        -------
+        e1, e4, o1, o4, f1, f4 : (n, ) float ndarray
+            the axial/torsional strain, stress and force/moment
+
+        """
+        n1, n2 = get_node_index(self.model.grid.node_id, self.node_ids).T
+        v1 = positions[n1, :] - positions[n2, :]
+        L = norm(v1, axis=1)
+        izero = np.flatnonzero(L == 0.0)
+        if len(izero):
+            msg = 'invalid %s length=0.0; element_id=%s\n%s' % (
+                self.type, self.element_id[izero], self.__repr__())
+            raise ZeroDivisionError(msg)
+        unit = v1 / L[:, np.newaxis]
+
+        i1, i2 = get_node_index(dofs[:, 0], self.node_ids).T
+        dq = q[dofs[i1, 1:]] - q[dofs[i2, 1:]]
+
+        # project the relative translations/rotations onto the rod axis
+        du_axial = (unit * dq[:, :3]).sum(axis=1)
+        du_torsion = (unit * dq[:, 3:]).sum(axis=1)
+
+        axial_strain = du_axial / L
+        torsional_strain = du_torsion * C / L
+
+        axial_stress = E * axial_strain
+        torsional_stress = G * torsional_strain
+
+        axial_force = axial_stress * A
+        torsional_moment = du_torsion * G * J / L
+        return (axial_strain, torsional_strain,
+                axial_stress, torsional_stress,
+                axial_force, torsional_moment)
@@ -6,6 +6,7 @@ from numpy import array, zeros, arange, searchsorted, unique, cross
 from numpy.linalg import norm  # type: ignore
 
 from pyNastran.dev.bdf_vectorized.cards.elements.shell.shell_element import ShellElement
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 
 from pyNastran.bdf.field_writer_8 import print_card_8
 from pyNastran.bdf.bdf_interface.assign_type import (
@@ -308,15 +309,16 @@ class CQUAD4(ShellElement):
         nu = mat.nu[0]
         #print('area=%s thickness=%s E=%e nu=%s' % (area, thickness, E, nu))
         #sdd
-        i1 = index0s[n1]
-        i2 = index0s[n2]
-        i3 = index0s[n3]
-        i4 = index0s[n4]
-
-        xyz1 = positions[n1]
-        xyz2 = positions[n2]
-        xyz3 = positions[n3]
-        xyz4 = positions[n4]
+        in1, in2, in3, in4 = get_node_index(model.grid.node_id, [n1, n2, n3, n4])
+        i1 = index0s[in1]
+        i2 = index0s[in2]
+        i3 = index0s[in3]
+        i4 = index0s[in4]
+
+        xyz1 = positions[in1]
+        xyz2 = positions[in2]
+        xyz3 = positions[in3]
+        xyz4 = positions[in4]
         xy = np.vstack([
             xyz1,
             xyz2,
@@ -464,6 +466,101 @@ class CQUAD4(ShellElement):
         self.model.log.info("K_norm / %s = \n" % knorm + list_print(K / knorm, float_fmt='%-4.4f'))
         return(K, dofs, n_ijv)
 
+    def get_stiffness_matrices(self, model, positions, dofs):
+        """
+        Gets the membrane stiffness matrices for all the CQUAD4/PSHELLs
+        in one pass
+
+        Parameters
+        ----------
+        model : BDF
+            the model
+        positions : (nnodes, 3) float ndarray
+            the node positions; positions[inode] = xyz
+        dofs : (nnodes, 7) int ndarray
+            the DOF map; dofs[inode, 0] = nid; dofs[inode, component] = dof
+
+        Returns
+        -------
+        K : (n, 12, 12) float ndarray
+            the membrane stiffness matrices in the global frame
+        element_dofs : (n, 12) int ndarray
+            the global DOFs of K; [n1 T123, n2 T123, n3 T123, n4 T123]
+
+        The stiffness is found in the plane of the element (the plane
+        normal to the diagonals, so a warped quad uses its projection)
+        and rotated to the global frame.  The material is an isotropic
+        MAT1, so the material angle (theta/mcid) and the in-plane x axis
+        don't change the membrane stiffness.
+        """
+        pshell = model.properties_shell.pshell
+        ipid = pshell.get_property_index_by_property_id(self.property_id)
+        assert np.all(pshell.material_id2[ipid] == -1), pshell.material_id2[ipid]
+        assert np.all(pshell.material_id3[ipid] == -1), pshell.material_id3[ipid]
+        assert np.all(pshell.material_id4[ipid] == -1), pshell.material_id4[ipid]
+        thickness = pshell.thickness[ipid]
+
+        mat1 = model.materials.mat1
+        imid = mat1.get_material_index_by_material_id(pshell.material_id[ipid])
+        E = mat1.E[imid]
+        nu = mat1.nu[imid]
+
+        # plane stress
+        denom = 1 - nu ** 2
+        nelements = self.n
+        C = np.zeros((nelements, 3, 3), dtype='float64')
+        C[:, 0, 0] = C[:, 1, 1] = E / denom
+        C[:, 0, 1] = C[:, 1, 0] = nu * E / denom
+        C[:, 2, 2] = E / (2.0 * (1.0 + nu))
+
+        # the element frame; z is normal to the diagonals and x is along n1-n2
+        xyz = positions[get_node_index(model.grid.node_id, self.node_ids), :]
+        normal = np.cross(xyz[:, 2, :] - xyz[:, 0, :], xyz[:, 3, :] - xyz[:, 1, :])
+        normal_norm = norm(normal, axis=1)
+        izero = np.flatnonzero(normal_norm == 0.0)
+        if len(izero):
+            msg = 'invalid %s area=0.0; element_id=%s\n%s' % (
+                self.type, self.element_id[izero], self.__repr__())
+            raise ZeroDivisionError(msg)
+        normal /= normal_norm[:, np.newaxis]
+        xaxis = xyz[:, 1, :] - xyz[:, 0, :]
+        xaxis -= (xaxis * normal).sum(axis=1)[:, np.newaxis] * normal
+        xaxis /= norm(xaxis, axis=1)[:, np.newaxis]
+        yaxis = np.cross(normal, xaxis)
+
+        # (n, 2, 3) global -> element; the nodes projected on the element plane
+        Te = np.stack([xaxis, yaxis], axis=1)
+        xy = np.einsum('nij,naj->nai', Te, xyz - xyz[:, :1, :])
+
+        # 2x2 Gauss integration
+        K = np.zeros((nelements, 8, 8), dtype='float64')
+        B = np.zeros((nelements, 3, 8), dtype='float64')
+        wts = [-0.57735, 0.57735]
+        for u in wts:
+            for v in wts:
+                Ji = array([
+                    [v - 1.0, -v + 1.0, v + 1.0, -v - 1.0],
+                    [u - 1.0, -u - 1.0, u + 1.0, -u + 1.0],
+                ]) / 4.
+                J = np.einsum('ij,njk->nik', Ji, xy)
+                det_j = np.linalg.det(J)
+                B1 = np.linalg.inv(J) @ Ji
+                B[:, 0, 0::2] = B1[:, 0, :]
+                B[:, 1, 1::2] = B1[:, 1, :]
+                B[:, 2, 0::2] = B1[:, 1, :]
+                B[:, 2, 1::2] = B1[:, 0, :]
+                K += np.einsum('nki,nkl,nlj->nij', B, C, B) * (
+                    thickness * det_j)[:, np.newaxis, np.newaxis]
+
+        # rotate the element T12 stiffness to the global T123 dofs
+        T = np.zeros((nelements, 8, 12), dtype='float64')
+        for inode in range(4):
+            T[:, 2*inode:2*inode+2, 3*inode:3*inode+3] = Te
+        K = np.einsum('nki,nkl,nlj->nij', T, K, T)
+
+        element_dofs = dofs[get_node_index(dofs[:, 0], self.node_ids), 1:4].reshape(nelements, 12)
+        return K, element_dofs
+
     def displacement_stress(self, model, positions, q, dofs):
         n = self.n
         stress = zeros(n, 'float64')
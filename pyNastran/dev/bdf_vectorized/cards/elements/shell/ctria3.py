@@ -3,6 +3,7 @@ from numpy import (array, zeros, arange, searchsorted,
 from numpy.linalg import norm  # type: ignore
 
 from pyNastran.dev.bdf_vectorized.cards.elements.shell.shell_element import ShellElement
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 
 from pyNastran.bdf.field_writer_8 import print_card_8
 from pyNastran.bdf.bdf_interface.assign_type import (integer, integer_or_blank,
@@ -296,9 +297,10 @@ class CTRIA3(ShellElement):
         pid = self.property_id[i]
         #prop = self.get_property_by_index(i)
         n1, n2, n3 = self.node_ids[i, :]
-        xyz1 = positions[n1]
-        xyz2 = positions[n2]
-        xyz3 = positions[n3]
+        in1, in2, in3 = get_node_index(model.grid.node_id, [n1, n2, n3])
+        xyz1 = positions[in1]
+        xyz2 = positions[in2]
+        xyz3 = positions[in3]
 
         #mat = prop.get_material(pid)
         mat = model.properties_shell.get_material(pid)
@@ -14,6 +14,7 @@ from pyNastran.bdf.field_writer_8 import print_card_8
 from pyNastran.bdf.bdf_interface.assign_type import integer
 
 from pyNastran.dev.bdf_vectorized.cards.elements.solid.solid_element import SolidElement
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 
 
 def quad_area_centroid(n1, n2, n3, n4):
@@ -133,16 +134,17 @@ class CHEXA8(SolidElement):
         rho = self.model.elements.properties_solid.psolid.get_density_by_property_id(pid)[0]
 
         n0, n1, n2, n3, n4, n5, n6, n7 = self.node_ids[i, :]
+        inids = get_node_index(model.grid.node_id, self.node_ids[i, :])
         V = volume8(
-            positions[self.node_ids[i, 0]],
-            positions[self.node_ids[i, 1]],
-            positions[self.node_ids[i, 2]],
-            positions[self.node_ids[i, 3]],
-
-            positions[self.node_ids[i, 4]],
-            positions[self.node_ids[i, 5]],
-            positions[self.node_ids[i, 6]],
-            positions[self.node_ids[i, 7]],
+            positions[inids[0]],
+            positions[inids[1]],
+            positions[inids[2]],
+            positions[inids[3]],
+
+            positions[inids[4]],
+            positions[inids[5]],
+            positions[inids[6]],
+            positions[inids[7]],
         )
 
         mass = rho * V
@@ -189,14 +191,8 @@ class CHEXA8(SolidElement):
         G = mat.G[0]
 
 
-        i0 = index0s[n0]
-        i1 = index0s[n1]
-        i2 = index0s[n2]
-        i3 = index0s[n3]
-        i4 = index0s[n4]
-        i5 = index0s[n5]
-        i6 = index0s[n6]
-        i7 = index0s[n7]
+        i0, i1, i2, i3, i4, i5, i6, i7 = index0s[get_node_index(
+            self.model.grid.node_id, [n0, n1, n2, n3, n4, n5, n6, n7])]
         dofs = array([
             i0, i0+1, i0+2,
             i1, i1+1, i1+2,
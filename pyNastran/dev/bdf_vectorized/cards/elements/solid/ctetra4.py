@@ -7,6 +7,7 @@ from numpy import zeros, arange, dot, cross, searchsorted, array, eye, ones
 from pyNastran.bdf.bdf_interface.assign_type import integer
 
 from pyNastran.dev.bdf_vectorized.cards.elements.solid.solid_element import SolidElement
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 
 def volume4(xyz1, xyz2, xyz3, xyz4):
     r"""
@@ -207,10 +208,11 @@ class CTETRA4(SolidElement):
         rho = self.model.elements.properties_solid.psolid.get_density_by_property_id(pid)[0]
 
         n0, n1, n2, n3 = self.node_ids[i, :]
-        V = volume4(positions[self.node_ids[i, 0]],
-                    positions[self.node_ids[i, 1]],
-                    positions[self.node_ids[i, 2]],
-                    positions[self.node_ids[i, 3]])
+        inids = get_node_index(model.grid.node_id, self.node_ids[i, :])
+        V = volume4(positions[inids[0]],
+                    positions[inids[1]],
+                    positions[inids[2]],
+                    positions[inids[3]])
 
         mass = rho * V
         if is_lumped:
@@ -258,10 +260,11 @@ class CTETRA4(SolidElement):
         rho = prop.get_density_by_property_id(pid)[0]
 
         n0, n1, n2, n3 = self.node_ids[i, :]
-        xyz1 = positions[self.node_ids[i, 0]]
-        xyz2 = positions[self.node_ids[i, 1]]
-        xyz3 = positions[self.node_ids[i, 2]]
-        xyz4 = positions[self.node_ids[i, 3]]
+        inids = get_node_index(model.grid.node_id, self.node_ids[i, :])
+        xyz1 = positions[inids[0]]
+        xyz2 = positions[inids[1]]
+        xyz3 = positions[inids[2]]
+        xyz4 = positions[inids[3]]
         vol = volume4(xyz1, xyz2, xyz3, xyz4)
 
         stiffness = rho * vol
@@ -372,10 +375,8 @@ class CTETRA4(SolidElement):
         return K, dofs, nijv
 
     def get_dofs_nijv(self, index0s, n0, n1, n2, n3):
-        i0 = index0s[n0]
-        i1 = index0s[n1]
-        i2 = index0s[n2]
-        i3 = index0s[n3]
+        i0, i1, i2, i3 = index0s[get_node_index(
+            self.model.grid.node_id, [n0, n1, n2, n3])]
         dofs = array([
             i0, i0+1, i0+2,
             i1, i1+1, i1+2,
@@ -1,6 +1,8 @@
 from numpy import array, zeros, unique, searchsorted, where, arange
 
-from pyNastran.dev.bdf_vectorized.cards.elements.spring.spring_element import SpringElement
+from pyNastran.dev.bdf_vectorized.cards.elements.spring.spring_element import (
+    SpringElement, get_spring_dofs)
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 
 from pyNastran.bdf.field_writer_8 import print_card_8
 from pyNastran.bdf.field_writer_16 import print_card_16
@@ -105,50 +107,28 @@ class CELAS1(SpringElement):
         c1, c2 = self.components[i, :]
         #i0, i1 = index0s
 
-        delta1 = 0 if c1 in [0, 1, 2, 3] else 3
-        delta2 = 0 if c2 in [0, 1, 2, 3] else 3
-
         c1b = c1-1 if c1 > 0 else c1
         c2b = c2-1 if c2 > 0 else c2
 
-        i1 = index0s[n1]
-        i2 = index0s[n2]
+        in1, in2 = get_node_index(model.grid.node_id, [n1, n2])
+        i1 = index0s[in1]
+        i2 = index0s[in2]
         dofs = [
             i1 + c1b,
-            i2 + c1b,
+            i2 + c2b,
         ]
 
         n_ijv = [
-            (n1, 1 + delta1),
-            (n2, 1 + delta2),
+            (n1, c1b + 1),
+            (n2, c2b + 1),
         ]
         return (k, dofs, n_ijv)
 
-    def displacement_stress(self, model, positions, q, dofs,
-                            ni, o1, e1, f1):
-        n = self.n
-
-        du_axial = zeros(n, 'float64')
-        for i in range(self.n):
-            (n1, n2) = self.node_ids[i, :]
-
-            n11 = dofs[(n1, 1)]
-            n21 = dofs[(n2, 1)]
-
-            q_axial = array([
-                q[n11],
-                q[n21],
-            ])
-            u_axial = q_axial
-            du_axial[i] = u_axial[0] - u_axial[1]
+    def get_stress_data(self, dofs):
+        idofs = get_spring_dofs(dofs, self.node_ids, self.components)
 
         self.model.log.debug("len(pelas) = %s" % self.model.pelas.n)
         i = searchsorted(self.model.pelas.property_id, self.property_id)
         k = self.model.pelas.K[i]
         s = self.model.pelas.s[i]
-        self.model.log.debug("k=%s s=%s du_axial=%s" % (k, s, du_axial))
-
-        e1[ni: ni+n] = du_axial * s
-        f1[ni: ni+n] = k * du_axial
-        o1[ni: ni+n] = f1[ni: ni+n] * s
-        #return (axial_strain, axial_stress, axial_force)
+        return idofs, k, s
@@ -2,7 +2,8 @@ import numpy as np
 from numpy import arange, array, dot, zeros, unique, searchsorted, transpose
 from numpy.linalg import norm  # type: ignore
 
-from pyNastran.dev.bdf_vectorized.cards.elements.spring.spring_element import SpringElement
+from pyNastran.dev.bdf_vectorized.cards.elements.spring.spring_element import (
+    SpringElement, get_spring_dofs)
 
 from pyNastran.bdf.field_writer_8 import print_card_8
 from pyNastran.bdf.field_writer_16 import print_card_16
@@ -117,19 +118,15 @@ class CELAS2(SpringElement):
         n1, n2 = self.node_ids[i, :]
 
         #print('c1, c2 = %s %s' % (c1, c2))
-        delta1 = 0 if c1 in [0, 1, 2, 3] else 3
-        delta2 = 0 if c2 in [0, 1, 2, 3] else 3
-        #print('delta1, delta2 = %s %s' % (delta1, delta2))
-
+        # a scalar point has a component of 0
         n_ijv = [
-            (n1, 1 + delta1),
-            (n2, 1 + delta2),
+            (n1, max(c1, 1)),
+            (n2, max(c2, 1)),
         ]
         dofs = n_ijv
         return (k, dofs, n_ijv)
 
-    def displacement_stress(self, model, positions, q, dofs,
-                            ni, o1, e1, f1):
+    def get_stress_data(self, dofs):
         """
         F = k * x
 
@@ -141,30 +138,5 @@ class CELAS2(SpringElement):
         F = k * du = 3.3
         stress = s * du
         """
-        n = self.n
-        du_axial = zeros(n, 'float32')
-        for i in range(self.n):
-            c1, c2 = self.components[i, :]
-            n1, n2 = self.node_ids[i, :]
-            #if n1 == n2:
-                #raise RuntimeError('CELAS2 eid=%s n1=%s n2=%s' % (self.element_id[i], n0, n1))
-
-            delta1 = 0 if c1 in [0, 1, 2, 3] else 3
-            delta2 = 0 if c2 in [0, 1, 2, 3] else 3
-            n11 = dofs[(n1, 1 + delta1)]
-            n21 = dofs[(n2, 1 + delta2)]
-
-            q_axial = array([
-                q[n11],
-                q[n21],
-            ])
-            u_axial = q_axial
-            du_axial[i] = u_axial[0] - u_axial[1]
-
-        s = self.s
-        ki = self.K
-
-        e1[ni : ni+n] = du_axial * s
-        f1[ni : ni+n] = ki * du_axial
-        o1[ni : ni+n] = f1[ni: ni+n] * s
-        #return (axial_strain, axial_stress, axial_force)
+        idofs = get_spring_dofs(dofs, self.node_ids, self.components)
+        return idofs, self.K, self.s
@@ -1,7 +1,9 @@
+import numpy as np
 from numpy import arange, array, dot, zeros, unique, searchsorted, transpose
 from numpy.linalg import norm  # type: ignore
 
-from pyNastran.dev.bdf_vectorized.cards.elements.spring.spring_element import SpringElement
+from pyNastran.dev.bdf_vectorized.cards.elements.spring.spring_element import (
+    SpringElement, get_spring_dofs)
 
 from pyNastran.bdf.field_writer_8 import print_card_8
 from pyNastran.bdf.field_writer_16 import print_card_16
@@ -121,31 +123,10 @@ class CELAS4(SpringElement):
         dofs = n_ijv
         return (k, dofs, n_ijv)
 
-    def displacement_stress(self, model, positions, q, dofs,
-                            ni, o1, e1, f1):
-
-        n = self.n
-        du_axial = zeros(n, 'float64')
-        for i in range(self.n):
-            n0, n1 = self.node_ids[i, :]
-
-            n11 = dofs[(n0, 1)]
-            n21 = dofs[(n1, 1)]
-
-            q_axial = array([
-                q[n11],
-                q[n21],
-            ])
-            u_axial = q_axial
-            du_axial[i] = u_axial[0] - u_axial[1]
-
-        s = self.s
-        ki = self.K
-
-        e1[ni : ni+n] = du_axial * s
-        f1[ni : ni+n] = ki * du_axial
-        o1[ni : ni+n] = f1[ni: ni+n] * s
-        #return (axial_strain, axial_stress, axial_force)
+    def get_stress_data(self, dofs):
+        components = np.ones(self.node_ids.shape, dtype='int32')
+        idofs = get_spring_dofs(dofs, self.node_ids, components)
+        return idofs, self.K, self.s
 
     def slice_by_index(self, i):
         obj = CELAS4(self.model)
@@ -1,4 +1,7 @@
+import numpy as np
+
 from pyNastran.dev.bdf_vectorized.cards.elements.element import Element
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 
 class SpringElement(Element):
     def __init__(self, model):
@@ -11,3 +14,60 @@ class SpringElement(Element):
            the BDF object
         """
         Element.__init__(self, model)
+
+    def get_stress_data(self, dofs):
+        """
+        Gets the data needed to recover the spring stress/strain/force
+
+        Parameters
+        ----------
+        dofs : (nnodes, 7) int ndarray
+            the DOF map; dofs[inode, 0] = nid; dofs[inode, component] = dof
+
+        Returns
+        -------
+        idofs : (n, 2) int ndarray
+            the internal ids of the end points
+        k : (n, ) float ndarray
+            the spring stiffness
+        s : (n, ) float ndarray
+            the stress coefficient
+        """
+        raise NotImplementedError(self.type)
+
+    def get_stiffness_matrices(self, model, positions, dofs):
+        """
+        Gets the stiffness matrices of all the springs
+
+        Parameters
+        ----------
+        dofs : (nnodes, 7) int ndarray
+            the DOF map; dofs[inode, 0] = nid; dofs[inode, component] = dof
+
+        Returns
+        -------
+        K : (n, 2, 2) float ndarray
+            the element stiffness matrices
+        idofs : (n, 2) int ndarray
+            the internal ids of the end points
+        """
+        idofs, k, unused_s = self.get_stress_data(dofs)
+        K = np.multiply.outer(k, [[1., -1.],
+                                  [-1., 1.]])
+        return K, idofs
+
+
+def get_spring_dofs(dofs, node_ids, components):
+    """
+    gets the (n, 2) internal ids of the spring end points
+
+    A component of 0 is a scalar point, which is stored as component 1.
+    A node id of 0 is ground, which has an internal id of -1.
+    """
+    components = np.where(components == 0, 1, components)
+    is_grounded = node_ids == 0
+    inids = np.zeros(node_ids.shape, dtype='int32')
+    inids[~is_grounded] = get_node_index(dofs[:, 0], node_ids[~is_grounded])
+    idofs = dofs[inids, components]
+    idofs[is_grounded] = -1
+    return idofs
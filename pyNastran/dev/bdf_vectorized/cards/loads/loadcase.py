@@ -1,6 +1,6 @@
 from collections import defaultdict
 
-from io import StringIO
+#from io import StringIO
 from pyNastran.utils.numpy_utils import integer_types
 from numpy import unique, where
 
@@ -42,9 +42,9 @@ class LoadCase:
         all_loads = self.loads[i]  # list of load objs
 
         #self.model.log.debug("**********")
-        f = StringIO()
-        for load in all_loads:
-            load.write_card(f)
+        #f = StringIO()
+        #for load in all_loads:
+            #load.write_card(f)
         #print(f.getvalue())
         #print("**********")
 
@@ -90,9 +90,9 @@ class LoadCase:
                 raise RuntimeError('i > 100')
         #print('------------------')
         #print("resolved LoadCase i=", i)
-        file_obj = StringIO()
-        for load in all_loads_out:
-            load.write_card(file_obj)
+        #file_obj = StringIO()
+        #for load in all_loads_out:
+            #load.write_card(file_obj)
         #print(file_obj.getvalue())
         #print('------------------')
         return all_loads_out
@@ -283,7 +283,7 @@ class GRID(VectorizedCard):
                 #print(j)
                 xyzi = xyz[j, :]
                 #xyzi = T.T @ (xyzi @ T)
-                xyz[j, :] = self.model.coords.get_global_position_by_xyz(xyzi, cp)
+                xyz[j, :] = self.model.coords.get_global_position_by_xyz(xyzi, int(cp))
 
         #assert len(node_ids) == len(cpn), 'n1=%s n2=%s'  %(len(node_ids), len(cpn))
         return xyz
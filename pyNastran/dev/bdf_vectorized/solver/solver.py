@@ -4,29 +4,30 @@
 http://slideplayer.com/slide/3330177/
 """
 import os
+import logging
 from datetime import date
 from struct import pack
 
 import numpy as np
-from numpy import (array, zeros, ones, arange,
-                   searchsorted, diag)
-from numpy.linalg import solve  # type: ignore
 
-import scipy
-from scipy.sparse import dok_matrix  # type: ignore
+from scipy.sparse import coo_matrix, csc_matrix, issparse  # type: ignore
+from scipy.sparse.linalg import splu, eigsh  # type: ignore
+from scipy.linalg import eigh, solve, LinAlgError  # type: ignore
 from cpylog import get_logger2
 
 # pyNastran
 import pyNastran.bdf.bdf_interface.dev.matrices
 from pyNastran.bdf.bdf_interface.dev.mass import make_gpwg
 from pyNastran.dev.bdf_vectorized.solver.utils import (
-    reverse_dict, partition_dense_symmetric, partition_dense_vector, remove_dofs)
+    reverse_dict, partition_sparse_symmetric, partition_dense_vector)
 #from pyNastran.f06.f06_writer import sorted_bulk_data_header
 from pyNastran.utils.dev import list_print
 from pyNastran.utils.mathematics import print_matrix, print_annotated_matrix
 from pyNastran.dev.bdf_vectorized.bdf import BDF #, SPC, SPC1
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 #from pyNastran.f06.f06_writer import F06Writer
 from pyNastran.op2.op2 import OP2
+from pyNastran.op2.result_objects.grid_point_weight import GridPointWeight
 
 # Tables
 #from pyNastran.op2.tables.opg_appliedLoads.opg_objects import (
@@ -35,7 +36,7 @@ from pyNastran.op2.op2 import OP2
 from pyNastran.op2.tables.oug.oug_displacements import RealDisplacementArray
 #from pyNastran.op2.tables.oqg_constraintForces.oqg_spcForces import SPCForcesObject
 #from pyNastran.op2.tables.oqg_constraintForces.oqg_mpcForces import MPCForcesObject
-#from pyNastran.f06.dev.tables.oload_resultant import Resultant
+from pyNastran.f06.tables.oload_resultant import Resultant
 
 # springs
 from pyNastran.op2.tables.oes_stressStrain.real.oes_springs import (
@@ -56,6 +57,7 @@ from pyNastran.op2.tables.oef_forces.oef_force_objects import RealCShearForceArr
 from pyNastran.op2.tables.oes_stressStrain.real.oes_beams import (
     RealBeamStressArray, RealBeamStrainArray)
 from pyNastran.op2.tables.oef_forces.oef_force_objects import RealCBeamForceArray
+from pyNastran.op2.tables.oes_stressStrain.real.oes_objects import set_element_case
 
 
 from pyNastran.op2.tables.opg_appliedLoads.opg_load_vector import (
@@ -66,11 +68,6 @@ def partition_dense_matrix(a, b, c=None):
     raise NotImplementedError('partition_dense_matrix a=%s b=%s c=%s' % (str(a), str(b), str(c)))
 
 
-class Resultant:
-    def __init__(self, table_name: str, total_load, subcase_id: int):
-        pass
-        #Resultant('OLOAD', total_load, self.subcase_id)
-
 class Solver(OP2):
     """
     Goals:
@@ -222,6 +219,9 @@ class Solver(OP2):
         self.Subtitle = None
         self.IDtoNidComponents = None
         self.nidComponentToID = None
+        #: ID[inode, 0] -> nid (sorted); ID[inode, component] -> internalID;
+        #: -1 for an undefined component
+        self.ID = None
         #==============================
         #: displacements
         self.U = None
@@ -328,6 +328,17 @@ class Solver(OP2):
         self.Kgg = None
         self.Mgg = None
         self.Mgg_sparse = None
+        self.ndofs = 0
+
+        #: (a-set dofs, factorization of Kaa); Kgg only depends on the model,
+        #: so the factorization is reused by subcases with the same a-set
+        self._Kaa_lu = None
+
+        #: LOAD id -> resolved FORCE/MOMENT cards
+        self._loads = {}
+
+        #: (model, positions, index0s); see build_position_tables
+        self._position_tables = None
         #------------------------------
         self.Us = None
         self.iUs = None
@@ -397,32 +408,45 @@ class Solver(OP2):
         """dummy function"""
         pass
 
+    def _get_lu(self, K, dofs):
+        """
+        gets the (cached) LU factorization of Kaa for the a-set dofs
+
+        Kgg doesn't change between subcases, so the same a-set means the
+        same Kaa and the factorization is reused.
+        """
+        dofs = np.asarray(dofs)
+        if self._Kaa_lu is not None and np.array_equal(self._Kaa_lu[0], dofs):
+            self.log.info('reusing the Kaa factorization')
+            return self._Kaa_lu[1]
+        lu = splu(csc_matrix(K))
+        self._Kaa_lu = (dofs.copy(), lu)
+        return lu
+
     def _solve(self, K, F, dofs):  # can be overwritten
         r"""solves \f$ [K]{x} = {F}\f$ for \f${x}\f$"""
-        self.log.info("--------------")
-        self.log.info("Kaa_norm / %s = \n" % self.knorm + list_print(K / self.knorm))
-        self.log.info("--------------")
-        self.log.info("Fa/%g = %s" % (self.fnorm, F / self.fnorm))
+        if _is_info(self.log):
+            # the dense (ndofs, ndofs) print is only built if it's shown
+            self.log.info("--------------")
+            self.log.info("Kaa_norm / %s = \n" % self.knorm + list_print(K.toarray() / self.knorm))
+            self.log.info("--------------")
+            self.log.info("Fa/%g = %s" % (self.fnorm, F / self.fnorm))
         if F[0] == 0.0:
             assert max(F) != min(F), 'no load is applied...'
         self.log.info("--------------")
 
+        msg = ''
         try:
-            U = scipy.sparse.linalg.spsolve(K, F)
+            # sparse LU (SuperLU); unlike spsolve, this raises on a singular
+            # matrix instead of returning nans, so AUTOSPC gets a chance
+            lu = self._get_lu(K, dofs)
+            U = lu.solve(F)
             #U = solve(K, F) # numpy
         except Exception:
-            failed = []
-            faileds = []
-            for i, iu in enumerate(dofs):
-                #absF = abs(F)
-                nid, dof = self.IDtoNidComponents[iu]
-                #if absF[iu] == 0.0 and ??:
-                if K[i, i] == 0.0:
-                    failed.append([nid, dof])
-                    faileds.append(i)
+            #if absF[iu] == 0.0 and ??:
+            faileds = np.flatnonzero(K.diagonal() == 0.0)
+            failed = [list(self.IDtoNidComponents[dofs[i]]) for i in faileds]
             msg = self.make_grid_point_singularity_table(failed)
-            self.f06_file.write(msg)
-            self.f06_file.flush()
 
             #if 'AUTOSPC' in self.model.params:
             if 1:
@@ -432,22 +456,31 @@ class Solver(OP2):
 
                 if value in [1, 'YES']:
                     # figure out what are the DOFs that are removed
-                    ilist = list(set(range(len(dofs))).difference(set(faileds)))
-                    ilist.sort()
+                    is_kept = np.ones(len(dofs), dtype='bool')
+                    is_kept[faileds] = False
+                    ilist = np.flatnonzero(is_kept)
 
                     # remove the DOFs and solve
-                    K2 = K[ilist, :][:, ilist]
+                    if issparse(K):
+                        # row slice on CSR, column slice on CSC
+                        K2 = K.tocsr()[ilist, :].tocsc()[:, ilist].toarray()
+                    else:
+                        K2 = K[np.ix_(ilist, ilist)]
                     F2 = F[ilist]
-                    U2 = solve(K2, F2)
+                    try:
+                        # Cholesky; K is SPD once the singular dofs are gone
+                        U2 = solve(K2, F2, assume_a='pos', check_finite=False)
+                    except LinAlgError:
+                        U2 = solve(K2, F2, assume_a='sym', check_finite=False)
 
                     # put the removed DOFs back in and set their displacement to 0.0
-                    U = zeros(len(F), 'float64')
+                    U = np.zeros(len(F), 'float64')
                     U[ilist] = U2
             else:
+                self.f06_file.write(msg)
                 self.f06_file.close()
                 raise
-        self.f06_file.write('-' * 80 + '\n')
-        self.f06_file.flush()
+        self.f06_file.write(msg + '-' * 80 + '\n')
         return U
 
     def run_solver(self):
@@ -476,6 +509,11 @@ class Solver(OP2):
         self.model.cards_to_read = get_solver_cards()
         self.model.f06 = self.f06_file
 
+        # a new model, so the stiffness matrix/loads have to be rebuilt
+        self.Kgg = None
+        self._Kaa_lu = None
+        self._loads = {}
+
         if 1:
             data = {
                 'bar1_a': 1.0,
@@ -490,7 +528,8 @@ class Solver(OP2):
             self.model.set_dynamic_syntax(data)
         self.model.read_bdf(bdf_filename)
         #------------------------------------------
-        self.f06_file = open(self.f06_filename, 'w') # , encoding=self.model._encoding
+        # the f06 is flushed when it's closed at the end of the run
+        self.f06_file = open(self.f06_filename, 'w', buffering=1 << 20) # , encoding=self.model._encoding
 
         self.f06_file.write(self.make_f06_header())
         #self.f06_file.write(sorted_bulk_data_header())
@@ -546,11 +585,13 @@ class Solver(OP2):
             self.log.info('starting case')
             self.run_case(self.model, case)
 
-        self.f06_file.write('Kgg / %s =\n%s\n\n' % (self.knorm, list_print(self.Kgg / self.knorm)))
-        self.f06_file.write('Fg =\n%s\n\n' % list_print(self.Fg))
-
-        self.f06_file.write('Kaa / %s =\n%s\n\n' % (self.knorm, list_print(self.Kaa / self.knorm)))
-        self.f06_file.write('Fa =\n%s\n\n' % list_print(self.Fa))
+        msg = [
+            'Kgg / %s =\n%s\n\n' % (self.knorm, list_print(self.Kgg.toarray() / self.knorm)),
+            'Fg =\n%s\n\n' % list_print(self.Fg),
+            'Kaa / %s =\n%s\n\n' % (self.knorm, list_print(self.Kaa.toarray() / self.knorm)),
+            'Fa =\n%s\n\n' % list_print(self.Fa),
+        ]
+        self.f06_file.write(''.join(msg))
 
         self.f06_file.close()
         if self.op2_file is not None:
@@ -620,22 +661,13 @@ class Solver(OP2):
                 #else:
                     #raise NotImplementedError('FORCE = %r is not supported' % value)
 
-            self.is_displacement_result = True
-            self.is_stress_result = True
-            self.is_strain_result = True
-            self.is_force_result = True
-            if not self.case_result_flags['DISPLACEMENT'][0]:
-                self.is_displacement_result = False
-            if not self.case_result_flags['STRESS'][0]:
-                self.is_stress_result = False
-            if not self.case_result_flags['STRAIN'][0]:
-                self.is_strain_result = False
-            if not self.case_result_flags['FORCE'][0]:
-                self.is_force_result = False
-
-            if not(self.is_displacement_result or
-                   self.is_stress_result or self.is_strain_result or
-                   self.is_force_result):
+            save_results = {name: flags[0] for name, flags in self.case_result_flags.items()}
+            self.is_displacement_result = save_results['DISPLACEMENT']
+            self.is_stress_result = save_results['STRESS']
+            self.is_strain_result = save_results['STRAIN']
+            self.is_force_result = save_results['FORCE']
+
+            if not any(save_results.values()):
                 msg = 'No results selected...'
                 raise RuntimeError(msg)
             if model.sol not in sols:
@@ -667,48 +699,51 @@ class Solver(OP2):
         self.case_result_flags[param_name] = [save_results, is_bool]
 
     def build_nid_component_to_id(self, model):
-        i = 0
-        nid_component_to_id_map = {}
         if model.grid.n:
             cd = set(model.grid.cd)
             if cd == 0:
                 raise NotImplementedError('Set cd=0; cd=%s is not supported.')
 
-        for ni in range(model.grid.n):  # GRIDs
-            nid = model.grid.node_id[ni]
-            ps = model.grid.ps[ni]
-
-            if ps > -1:
-                self.log.info('node_id=%s ps=%s' % (nid, ps))
-                iUsg = []
-                Usg = []
-                j = None
-                while ps > 0:
-                    psi = ps % 10
-                    j = i + psi - 1
-                    iUsg.append(j)
-                    Usg.append(0.0)
-                    ps = ps // 10
-                self.log.info("  Usg=%s" % Usg)
-                self.iUsg += iUsg
-                self.Usg += Usg
-
-            nid_component_to_id_map[(nid, 1)] = i
-            nid_component_to_id_map[(nid, 2)] = i + 1
-            nid_component_to_id_map[(nid, 3)] = i + 2
-            nid_component_to_id_map[(nid, 4)] = i + 3
-            nid_component_to_id_map[(nid, 5)] = i + 4
-            nid_component_to_id_map[(nid, 6)] = i + 5
-            i += 6
-        self.log.info('iUsg = %s' % (self.iUsg))
+        # GRIDs; component c of the i-th node is DOF 6*i + c - 1
+        ngrids = model.grid.n
+        nids = np.ascontiguousarray(model.grid.node_id, dtype='int32')
+        ps = np.ascontiguousarray(model.grid.ps, dtype='int32')
+        components = np.arange(1, 7)
+        dofs = 6 * np.arange(ngrids)[:, None] + (components - 1)
+        nid_component_to_id_map = dict(zip(
+            zip(np.repeat(nids, 6).tolist(),
+                np.tile(components, ngrids).tolist()),
+            dofs.ravel().tolist()))
+        i = 6 * ngrids
+
+        # the PS field is a packed component string (e.g., 123456)
+        ips = np.flatnonzero(ps > -1)
+        if len(ips):
+            # the digits from least to most significant
+            digits = ps[ips, None] // 10 ** np.arange(6) % 10
+            inode, idigit = np.nonzero(digits)
+            iUsg = dofs[ips[inode], 0] + digits[inode, idigit] - 1
+            self.iUsg += iUsg.tolist()
+            self.Usg += [0.0] * len(iUsg)
+        if _is_info(self.log):
+            self.log.info('iUsg = %s' % (self.iUsg))
 
         spoint = model.spoint
-        if spoint.n:
-            for nid in sorted(model.spoint.spoint):  # SPOINTS
-                nid_component_to_id_map[(nid, 1)] = i
-                i += 1
+        spoints = np.array(sorted(spoint.spoint) if spoint.n else [], dtype='int32')
+        for nid in spoints.tolist():  # SPOINTS
+            nid_component_to_id_map[(nid, 1)] = i
+            i += 1
         assert i > 0, 'no DOFs'
 
+        # the array version of nid_component_to_id_map; one row per node
+        # sorted by node id, so the row of a node is found with searchsorted
+        ID = np.full((ngrids + len(spoints), 7), -1, dtype='int32')
+        ID[:ngrids, 0] = nids
+        ID[:ngrids, 1:] = dofs
+        ID[ngrids:, 0] = spoints
+        ID[ngrids:, 1] = np.arange(6 * ngrids, i, dtype='int32')
+        self.ID = ID[np.argsort(ID[:, 0], kind='stable')]
+
         #: starting index for MPC cards
         self.mp_index = model.grid.n + spoint.n
 
@@ -782,9 +817,9 @@ class Solver(OP2):
         #self.build_dof_sets()
         #Lambda, Ua = self.solve_sol_103(Kgg, Mgg)
 
-        #dofsAll = {i for i in range(n)}
-        #dofsA = remove_dofs(dofsAll, self.iUs)
-        #dofsA.sort()
+        #is_a = np.ones(n, dtype='bool')
+        #is_a[self.iUs] = False
+        #dofsA = np.flatnonzero(is_a)
         #U = zeros(n, 'float64')
 
         ## TODO handle MPCs
@@ -847,33 +882,36 @@ class Solver(OP2):
             self.log.info("------------------------\n")
             self.log.info("solving...")
             Ua = self.solve_sol_101(Kgg, Fg)
-            self.log.info("Ua =\n%s" % Ua)
-            self.log.info("Us =\n%s" % self.Us)
-
-            dofsAll = {i for i in range(n)}
-            #dofsA = remove_dofs(remove_dofs(dofsAll, self.iUs), self.iUm))
-            dofsA = remove_dofs(dofsAll, self.iUs)
-            dofsA.sort()
-            U = zeros(n, 'float64')
-            self.log.info("U   =\n%s" % U)
-            self.log.info("iUs =\n%s" % self.iUs)
+            is_info = _is_info(self.log)
+            if is_info:
+                self.log.info("Ua =\n%s" % Ua)
+                self.log.info("Us =\n%s" % self.Us)
+
+            # the a-set is everything that isn't in the s-set
+            iUs = np.asarray(self.iUs, dtype='int32')
+            is_a = np.ones(n, dtype='bool')
+            is_a[iUs] = False
+            #is_a[self.iUm] = False
+            dofsA = np.flatnonzero(is_a)
+            U = np.zeros(n, 'float64')
+            if is_info:
+                self.log.info("iUs =\n%s" % self.iUs)
             #print("iUm = ", self.iUm)
 
             # TODO handle MPCs
-            for (i, iu) in enumerate(self.iUs):
-                U[iu] = self.Us[i]
-            for (i, iu) in enumerate(dofsA):
-                U[iu] = Ua[i]
+            U[iUs] = self.Us
+            U[dofsA] = Ua
 
-            self.log.info("*U = \n%s" % U)
-            self.log.info("dofsA = %s" % dofsA)
+            if is_info:
+                self.log.info("*U = \n%s" % U)
+                self.log.info("dofsA = %s" % dofsA)
 
             if self.is_displacement_result:
                 self._store_displacements(model, U, case)
             q = U
         else:
             n = len(model.nodes)
-            q = ones(n, 'float64')
+            q = np.ones(n, 'float64')
 
         # =====================================================================
         # results
@@ -902,55 +940,59 @@ class Solver(OP2):
         #nchexa8s  = model.elements_solid.chexa8.n
 
         #=========================
-        if self.is_stress_result or self.is_strain_result or self.is_force_result:
+        is_stress = self.is_stress_result
+        is_strain = self.is_strain_result
+        is_force = self.is_force_result
+        positions = self.positions
+        ID = self.ID
+        nid_component_to_id = self.nidComponentToID
+
+        # the OES tables to store; decided once instead of per element type
+        oes_types = [Type for (Type, is_result) in [('strain', is_strain), ('stress', is_stress)]
+                     if is_result]
+        if oes_types or is_force:
             # SPRINGS
-            nsprings = 0
             element_types = [
-                model.celas1,
-                model.celas2,
-                model.celas3,
-                model.celas4,
-            ]
-            for element_type in element_types:
-                nsprings = element_type.n
-
-                if nsprings == 0:
-                    continue
-                o1 = zeros(nsprings, 'float64')
-                e1 = zeros(nsprings, 'float64')
-                f1 = zeros(nsprings, 'float64')
-
+                element_type for element_type in [
+                    model.celas1,
+                    model.celas2,
+                    model.celas3,
+                    model.celas4,
+                ] if element_type.n]
+            if element_types:
+                # stack the springs, so the stress/strain/force is found in one shot
+                data = [element_type.get_stress_data(ID)
+                        for element_type in element_types]
+                idofs = np.vstack([datai[0] for datai in data])
+                k = np.hstack([datai[1] for datai in data])
+                s = np.hstack([datai[2] for datai in data])
+                del data
+
+                # the OES/OEF tables store these as float32
+                du_axial = q[idofs[:, 0]] - q[idofs[:, 1]]
+                e1 = du_axial * s
+                f1 = k * du_axial
+                o1 = f1 * s
+
+                oes_results = {'strain': e1, 'stress': o1}
                 ispring = 0
                 for element_type in element_types:
                     n = element_type.n
-                    #print("n%s = %s" % (element_type.type, n))
-                    if n:
-                        element_type.displacement_stress(
-                            model, self.positions, q, self.nidComponentToID,
-                            ispring, o1, e1, f1)
-                        eids = element_type.element_id
-                        self.log.info("eids = %s" % eids)
-
-                        self._store_spring_oes(model, eids, e1, case, element_type.type,
-                                               Type='strain')
-                        #if self.is_stress_result:
-                        self._store_spring_oes(model, eids, o1, case, element_type.type,
-                                               Type='stress')
-                        #if self.is_force_result:
-                        self._store_spring_oef(model, eids, f1, case, element_type.type)
-                        del e1
-                        del o1
-                        del f1
-                    ispring += n
-                    #if self.is_strain:
+                    eids = element_type.element_id
+                    self.log.info("eids = %s" % eids)
+                    ispring2 = ispring + n
+                    for Type in oes_types:
+                        self._store_spring_oes(model, eids, oes_results[Type][ispring:ispring2],
+                                               case, element_type.type, Type=Type)
+                    if is_force:
+                        self._store_spring_oef(model, eids, f1[ispring:ispring2], case,
+                                               element_type.type)
+                    ispring = ispring2
+                del e1, o1, f1, oes_results
             #del element_type model.elements_springs
 
             # RODS
             element_types = [model.crod, model.conrod]  # model.ctube
-
-            self.is_stress_result = True
-            self.is_strain_result = True
-            self.is_force_result = True
             for element_type in element_types:
                 n = element_type.n
                 self.log.info('Type=%s n=%s displacement_stress' % (element_type.type, n))
@@ -961,19 +1003,16 @@ class Solver(OP2):
                     (e1, e4,
                      o1, o4,
                      f1, f4) = element_type.displacement_stress(
-                         model, self.positions, q, self.nidComponentToID)
+                         model, positions, q, ID)
                     eids = element_type.element_id
-                    if self.is_strain_result:
+                    oes_results = {'strain': (e1, e4), 'stress': (o1, o4)}
+                    for Type in oes_types:
+                        axial, torsion = oes_results[Type]
                         self._store_rod_oes(
-                            model, eids, e1, e4, case, element_type.type, Type='strain')
-                    del e1, e4
-                    if self.is_stress_result:
-                        self._store_rod_oes(
-                            model, eids, o1, o4, case, element_type.type, Type='stress')
-                    del o1, o4
-                    if self.is_force_result:
+                            model, eids, axial, torsion, case, element_type.type, Type=Type)
+                    if is_force:
                         self._store_rod_oef(model, eids, f1, f4, case, element_type.type)
-                    del f1, f4
+                    del e1, e4, o1, o4, f1, f4, oes_results
                 del element_type
 
             #=========================
@@ -986,14 +1025,15 @@ class Solver(OP2):
                 #strain = zeros((ncshears, 3), 'float64')
                 #force  = zeros((ncshears, 16), 'float64')
 
-                stress, strain, force = element_type.displacement_stress(
-                    model, self.positions, q, self.nidComponentToID)
+                stress, strain, force = cshears.displacement_stress(
+                    model, positions, q, nid_component_to_id)
+                eids = cshears.element_id
                 #if self.is_strain:
-                self._store_cshear_oes(model, cshears, strain, case, 'CSHEAR', Type='strain')
+                self._store_cshear_oes(model, eids, strain, case, 'CSHEAR', Type='strain')
                 #if self.is_stress:
-                self._store_cshear_oes(model, cshears, stress, case, 'CSHEAR', Type='stress')
+                self._store_cshear_oes(model, eids, stress, case, 'CSHEAR', Type='stress')
                 #if self.is_force:
-                self._store_cshear_oef(model, cshears, force, case, 'CSHEAR')
+                self._store_cshear_oef(model, eids, force, case, 'CSHEAR')
                 del stress
                 del strain
                 del force
@@ -1004,12 +1044,12 @@ class Solver(OP2):
             if ncbars:
                 cbars = model.cbar
                 self.log.info("ncbars = %s" % ncbars)
-                o1 = zeros(ncbars, 'float64')
-                e1 = zeros(ncbars, 'float64')
-                f1 = zeros(ncbars, 'float64')
+                o1 = np.zeros(ncbars, 'float64')
+                e1 = np.zeros(ncbars, 'float64')
+                f1 = np.zeros(ncbars, 'float64')
                 for i, eid in enumerate(cbars):
                     element = cbars[eid]
-                    (exi, oxi, fxi) = element.displacement_stress(model, q, self.nidComponentToID)
+                    (exi, oxi, fxi) = element.displacement_stress(model, q, nid_component_to_id)
                     o1[i] = oxi
                     e1[i] = exi
                     f1[i] = fxi
@@ -1025,13 +1065,14 @@ class Solver(OP2):
 
             #=========================
             # BEAMS
+            #ncbeams = model.cbeam.n  # no CBEAM stiffness matrix yet
             ncbeams = 0
             if ncbeams:
                 cbeams = model.cbeam
                 self.log.info("ncbeams = %s" % ncbeams)
-                o1 = zeros(ncbeams, 'float64')
-                e1 = zeros(ncbeams, 'float64')
-                f1 = zeros(ncbeams, 'float64')
+                o1 = np.zeros(ncbeams, 'float64')
+                e1 = np.zeros(ncbeams, 'float64')
+                f1 = np.zeros(ncbeams, 'float64')
                 for i, eid in enumerate(cbeams):
                     element = cbeams[eid]
                     (exi, oxi, fxi) = element.displacement_stress(model, q, self.nidComponentToID)
@@ -1056,17 +1097,17 @@ class Solver(OP2):
             ncquad4s = 0
             if nctria3s or ncquad4s:
                 self.log.info("nctria3 = %s" % nctria3s)
-                stress = zeros((nctria3s+ncquad4s, 3), 'float64')
-                strain = zeros((nctria3s+ncquad4s, 3), 'float64')
-                force = zeros((nctria3s+ncquad4s, 3), 'float64')
+                stress = np.zeros((nctria3s+ncquad4s, 3), 'float64')
+                strain = np.zeros((nctria3s+ncquad4s, 3), 'float64')
+                force = np.zeros((nctria3s+ncquad4s, 3), 'float64')
 
-            i0 = i
+            i0 = 0
             if nctria3s:
                 ctria3s = model.ctria3
                 for i, eid in enumerate(ctria3s):
                     element = elements[eid]
                     (stressi, straini, forcei) = element.displacement_stress(
-                        model, q, self.nidComponentToID)
+                        model, q, nid_component_to_id)
                     stress[i, :] = stressi
                     strain[i, :] = straini
                     force[i, :] = forcei
@@ -1077,7 +1118,7 @@ class Solver(OP2):
                 for i, eid in enumerate(ncquad4s):
                     element = cquad4s[eid]
                     (stressi, straini, forcei) = element.displacement_stress(
-                        model, q, self.nidComponentToID)
+                        model, q, nid_component_to_id)
                     stress[i0+i, :] = stressi
                     strain[i0+i, :] = straini
                     force[i0+i, :] = forcei
@@ -1095,9 +1136,9 @@ class Solver(OP2):
         #=========================
         self.log.debug(self.displacements[1].data)
         #self.log.debug(self.displacements[1])
-        self.log.debug(self.conrod_force)
-        self.log.debug(self.conrod_stress)
-        self.log.debug(self.conrod_strain)
+        self.log.debug(self.op2_results.force.conrod_force)
+        self.log.debug(self.op2_results.stress.conrod_stress)
+        self.log.debug(self.op2_results.strain.conrod_strain)
         self.write_f06(self.f06_file, end_flag=True, quiet=True, close=False)
         self.write_op2(self.op2_file, packing=True)
         self.write_op2(self.op2_pack_file, packing=False)
@@ -1187,9 +1228,9 @@ class Solver(OP2):
         stress.add_f06_data(data, dt)
 
         if element_type == 'CBEAM' and Type == 'stress':
-            self.cbeam_stress[isubcase] = stress
+            self.op2_results.stress.cbeam_stress[isubcase] = stress
         elif element_type == 'CBEAM' and Type == 'strain':
-            self.cbeam_strain[isubcase] = stress
+            self.op2_results.strain.cbeam_strain[isubcase] = stress
         else:
             raise NotImplementedError('element_type=%r Type=%r' % (element_type, Type))
         stress.dt = None
@@ -1238,7 +1279,7 @@ class Solver(OP2):
         forces.add_f06_data(data, dt)
 
         if element_type == 'CBEAM':
-            self.cbeam_force[isubcase] = forces
+            self.op2_results.force.cbeam_force[isubcase] = forces
         else:
             raise NotImplementedError(element_type)
         #stress.dt = None
@@ -1263,6 +1304,8 @@ class Solver(OP2):
             element_type = None
         elif element_name == 'CONROD':
             element_type = None
+        elif element_name == 'CSHEAR':
+            element_type = 4
         else:
             raise NotImplementedError(element_name)
 
@@ -1285,20 +1328,18 @@ class Solver(OP2):
         isubcase = case.id
 
         if element_name == 'CSHEAR':
-            forces = RealCShearForceArray(data_code, is_sort1, isubcase, dt=False)
+            obj_class = RealCShearForceArray
         else:
             raise NotImplementedError(element_name)
 
-        data = []
-        #(elementID,
-        #   f12, f14, tau1,
-        #   ...) = line
-        for (eid, Fi) in zip(eids, force):
-            line = [eid] + list(Fi)
-            data.append(line)
-
-        dt = None
-        forces.add_f06_data(data, dt)
+        #(force41, force21, force12, force32, force23, force43,
+        # force34, force14,
+        # kick_force1, shear12, kick_force2, shear23,
+        # kick_force3, shear34, kick_force4, shear41) = data
+        data = np.asarray(force, dtype='float32').reshape(1, len(eids), 16)
+        forces = set_element_case(
+            obj_class, data_code, is_sort1, isubcase,
+            np.asarray(eids), data, [None])
 
         if element_name == 'CSHEAR':
             self.cshear_force[isubcase] = forces
@@ -1335,39 +1376,37 @@ class Solver(OP2):
         #transient = False
         isubcase = case.id
         is_sort1 = True
-        dt = None
+        #dt = None
         format_code = 1  # ???
         s_code = None
 
+        stress_code = 0
+        if Type == 'strain':
+            stress_code = 1
+
         data_code = {
             'log': self.log, 'analysis_code': analysis_code,
             'device_code': 1, 'table_code': 1, 'sort_code': 0,
-            'sort_bits': [0, 0, 0], 'num_wide': 8, 'table_name': 'OES',
-            'element_name': element_type, 'format_code':format_code,
+            'sort_bits': [0, 0, 0], 'num_wide': 4, 'table_name': 'OES',
+            'element_name': element_type, 'element_type': 4,
+            'format_code':format_code,
             's_code': s_code,
-            'nonlinear_factor': None, 'data_names':['lsdvmn']}
+            'nonlinear_factor': None, 'data_names':['lsdvmn'],
+            'stress_bits' : [None, stress_code, None, stress_code, None],
+        }
 
         if Type == 'stress':
-            #if element_type == 'CELAS2':
-            stress = RealShearStressArray(data_code, is_sort1, isubcase, dt=None)
-            #else:
-                #raise NotImplementedError(element_type)
+            obj_class = RealShearStressArray
         elif Type == 'strain':
-            #if element_type == 'CELAS2':
-            stress = RealShearStrainArray(data_code, is_sort1, isubcase, dt=None)
-            #else:
-                #raise NotImplementedError(element_type)
+            obj_class = RealShearStrainArray
         else:
             raise NotImplementedError(Type)
 
-        data = []
-        i = 0
-        #(elementID, max_shear, avg_shear, margin) = line
-        for i, eid in enumerate(eids):
-            resultsi = results[i, :]
-            line = [eid] + list(resultsi)
-            data.append(line)
-        stress.add_f06_data(data, dt)
+        #(max_shear, avg_shear, margin) = data
+        data = np.asarray(results, dtype='float32').reshape(1, len(eids), 3)
+        stress = set_element_case(
+            obj_class, data_code, is_sort1, isubcase,
+            np.asarray(eids), data, [None])
 
         if Type == 'stress':
             self.cshear_stress[isubcase] = stress
@@ -1435,24 +1474,24 @@ class Solver(OP2):
         #print('axial %s = %s' % (Type, axial))
         if Type == 'stress':
             if element_name == 'CELAS1':
-                self.celas1_stress[isubcase] = result
+                self.op2_results.stress.celas1_stress[isubcase] = result
             elif element_name == 'CELAS2':
-                self.celas2_stress[isubcase] = result
+                self.op2_results.stress.celas2_stress[isubcase] = result
             elif element_name == 'CELAS3':
-                self.celas3_stress[isubcase] = result
+                self.op2_results.stress.celas3_stress[isubcase] = result
             elif element_name == 'CELAS4':
-                self.celas4_stress[isubcase] = result
+                self.op2_results.stress.celas4_stress[isubcase] = result
             else:
                 raise NotImplementedError('element_name=%r Type=%r' % (element_name, Type))
         elif Type == 'strain':
             if element_name == 'CELAS1':
-                self.celas1_strain[isubcase] = result
+                self.op2_results.strain.celas1_strain[isubcase] = result
             elif element_name == 'CELAS2':
-                self.celas2_strain[isubcase] = result
+                self.op2_results.strain.celas2_strain[isubcase] = result
             elif element_name == 'CELAS3':
-                self.celas3_strain[isubcase] = result
+                self.op2_results.strain.celas3_strain[isubcase] = result
             elif element_name == 'CELAS4':
-                self.celas4_strain[isubcase] = result
+                self.op2_results.strain.celas4_strain[isubcase] = result
             else:
                 raise NotImplementedError('element_name=%r Type=%r' % (element_name, Type))
         else:
@@ -1473,18 +1512,18 @@ class Solver(OP2):
         ntimes = 1
         nelements = eids.size
         dtype = 'float32'
-        forces.build_data(ntimes, nelements, dtype)
+        forces.build_data(ntimes, nelements, dtype, 'int32', dtype)
         forces.data[0, :, 0] = axial
         forces.element = eids
 
         if element_name == 'CELAS1':
-            self.celas1_force[isubcase] = forces
+            self.op2_results.force.celas1_force[isubcase] = forces
         elif element_name == 'CELAS2':
-            self.celas2_force[isubcase] = forces
+            self.op2_results.force.celas2_force[isubcase] = forces
         elif element_name == 'CELAS3':
-            self.celas3_force[isubcase] = forces
+            self.op2_results.force.celas3_force[isubcase] = forces
         elif element_name == 'CELAS4':
-            self.celas4_force[isubcase] = forces
+            self.op2_results.force.celas4_force[isubcase] = forces
         else:
             raise NotImplementedError(element_name)
         #stress.dt = None
@@ -1515,11 +1554,11 @@ class Solver(OP2):
         forces.element = eids
 
         if element_type == 'CROD':
-            self.crod_force[isubcase] = forces
+            self.op2_results.force.crod_force[isubcase] = forces
         elif element_type == 'CONROD':
-            self.conrod_force[isubcase] = forces
+            self.op2_results.force.conrod_force[isubcase] = forces
         elif element_type == 'CTUBE':
-            self.ctube_force[isubcase] = forces
+            self.op2_results.force.ctube_force[isubcase] = forces
         else:
             raise NotImplementedError(element_type)
         #stress.dt = None
@@ -1584,7 +1623,7 @@ class Solver(OP2):
                 raise NotImplementedError('element_type=%r Type=%r' % (element_type, Type))
         else:
             raise NotImplementedError('element_type=%r Type=%r' % (element_type, Type))
-        result.build_data(ntimes, nelements, dtype)
+        result.build_data(ntimes, nelements, dtype, 'int32', dtype)
         result.data[0, :, :] = data
         result.element = eids
 
@@ -1613,8 +1652,7 @@ class Solver(OP2):
         disp = RealDisplacementArray(data_code, is_sort1, isubcase, dt=None)
 
         ntotal = nnodes
-        disp.build_data(ntimes, nnodes, ntotal,
-                        ntimes, nnodes, float_fmt='float32')
+        disp.build_data(ntimes, nnodes, ntotal, float_fmt='float32')
         #data = []
 
         #i = 0
@@ -1626,13 +1664,19 @@ class Solver(OP2):
         #grid_type = 7  # RIGID POINT (e.g. RBE3); L
         disp.node_gridtype[:, 0] = model.grid.node_id
         disp.node_gridtype[:, 1] = 1 # GRID (TODO: no SPOINTs)
-        disp.data[0, :, :] = U.reshape(1, nnodes, 6)
+        # the GRID DOFs come first (6 per node); the SPOINTs are packed after them
+        disp.data[0, :, :] = U[:6 * nnodes].reshape(nnodes, 6)
         self.displacements[isubcase] = disp
         self.isubcases.append(isubcase)
 
     def setup_sol_101(self, model, case):
-        # the (GridID,componentID) -> internalID
-        (self.nidComponentToID, ndofs) = self.build_nid_component_to_id(model)
+        if self.Kgg is not None:
+            # Kgg doesn't depend on the subcase
+            ndofs = self.ndofs
+        else:
+            # the (GridID,componentID) -> internalID
+            (self.nidComponentToID, ndofs) = self.build_nid_component_to_id(model)
+            self.ndofs = ndofs
         #self.log.info('apply SPCs')
         #self.apply_SPCs(model, case, self.nidComponentToID)
         #self.log.info('apply MPCs')
@@ -1644,17 +1688,17 @@ class Solver(OP2):
         #self.log.info('building Mgg')
         #Mgg = self.get_Mgg(model, ndofs, force_calcs=True)
 
-        ngrids = model.grid.n
-        xyz_cid0 = np.zeros((ngrids, 3), dtype='float64')
-        xyz = model.grid.xyz  ## TODO: update for coords
-        for i in range(ngrids):
-            xyz_cid0[i, :] = xyz[i, :]
+        xyz_cid0 = np.array(model.grid.xyz, dtype='float64')  ## TODO: update for coords
 
         self.log.info('building Fg')
         Fg = self.assemble_forces(model, ndofs, case, self.nidComponentToID, xyz_cid0)
 
-        self.log.info('building Kgg')
-        Kgg, Kgg_sparse = self.assemble_global_stiffness_matrix(model, ndofs, self.nidComponentToID)
+        if self.Kgg is None:
+            self.log.info('building Kgg')
+            Kgg, Kgg_sparse = self.assemble_global_stiffness_matrix(model, ndofs, self.nidComponentToID)
+            self._Kaa_lu = None
+        else:
+            Kgg = self.Kgg
 
         self.log.info('ready to run...')
         return Kgg, Fg, ndofs
@@ -1676,41 +1720,36 @@ class Solver(OP2):
             node2 = [1., 0., 0.]
             node3 = [0.5, 1., 0.]
             node4 = [0.5, 0., 1.]
-            xyz_cid0 = array([node1, node2, node3, node4],
-                             dtype='float32')
+            xyz_cid0 = np.array([node1, node2, node3, node4],
+                                dtype='float32')
             cg = xyz_cid0.mean(axis=0)
             self.log.info('cg = %s' % cg)
         else:
-            xyz_cid0 = zeros((self.model.grid.n, 3), dtype='float32')
-            for i, (key, xyz) in enumerate(sorted(self.positions.items())):
-                xyz_cid0[i, :] = xyz
-
-            #xyz_cid0 = self.model.grid.get_xyz(cid=0)
+            grid = self.model.grid
+            if not grid.cp.any():
+                # everything is in the basic frame, so there's nothing to transform
+                xyz_cid0 = grid.xyz
+            else:
+                xyz_cid0 = grid.get_position_by_node_index()
 
-        grid_point = 2
         if grid_point in [-1, 0]:
             # -1 is don't compute a mass matrix, but since we're in this function,
             # we use the origin.
-            ref_point = zeros(3, dtype='float32')
+            ref_point = np.zeros(3, dtype='float32')
         else:
             # find mass/inertia about point G
-            ref_point = self.positions[grid_point]
-
-        grid_cps = self.model.grid.cp
-        coords = self.model.coords
-        Mo, S, mass, cg, II, IQ, Q = make_gpwg(
-            Mgg, ref_point, xyz_cid0, grid_cps, coords, self.log)
-
-        self.grid_point_weight.reference_point = grid_point
-        self.grid_point_weight.MO = Mo
-        self.grid_point_weight.S = S
-        self.grid_point_weight.mass = mass
-        self.grid_point_weight.cg = cg
-        self.grid_point_weight.IS = II
-        self.grid_point_weight.IQ = diag(IQ)
-        self.grid_point_weight.Q = Q
+            ref_point = xyz_cid0[get_node_index(grid.node_id, grid_point)]
 
+        spoint = self.model.spoint
+        spoints = np.array(sorted(spoint.spoint) if spoint.n else [], dtype='int32')
+        coords = self.model.coords.coords
+        unused_D, Mo, mass, cg, S, IS, unused_II, IQ, Q = make_gpwg(
+            Mgg, ref_point, grid.node_id, grid.cp, grid.cd, xyz_cid0,
+            spoints, coords, self.log)
 
+        weight = GridPointWeight(
+            int(grid_point), Mo, S, mass, cg, IS, np.diag(IQ), Q)
+        self.grid_point_weight[weight.superelement_adaptivity_index] = weight
 
     def _save_applied_load(self, Fg):
         data_code = {
@@ -1736,11 +1775,9 @@ class Solver(OP2):
             dt)
         ntimes = 1
         nnodes = Fg.size // 6
-        nx = ntimes
-        ny = nnodes
         float_fmt = 'float32'
         ntotal = nnodes
-        applied_loads.build_data(ntimes, nnodes, ntotal, nx, ny, float_fmt)
+        applied_loads.build_data(ntimes, nnodes, ntotal, float_fmt)
         applied_loads.node_gridtype[:, 0] = self.model.grid.node_id
         applied_loads.node_gridtype[:, 1] = 1 # G
         self.load_vectors[self.subcase_id] = applied_loads
@@ -1751,31 +1788,47 @@ class Solver(OP2):
         self.Fg = Fg
 
         self._save_applied_load(Fg)
-        for (i, j, a) in zip(self.iUm, self.jUm, self.Um):
-            self.log.info("Kgg[%s, %s] = %s" % (i, j, a))
-            Kgg[i, j] = a
+        is_info = _is_info(self.log)
+        is_mpc = self.iUm is not None and len(self.iUm) > 0
+        if is_mpc:
+            # the MPC terms are subcase dependent, so write them into a copy;
+            # self.Kgg is reused by the other subcases
+            Kgg = Kgg.tolil(copy=True)
+            for (i, j, a) in zip(self.iUm, self.jUm, self.Um):
+                if is_info:
+                    self.log.info("Kgg[%s, %s] = %s" % (i, j, a))
+                Kgg[i, j] = a
+            Kgg = Kgg.tocsr()
+
+            # the cached factorization is keyed on the a-set only
+            self._Kaa_lu = None
 
         self.IDtoNidComponents = reverse_dict(self.nidComponentToID)
-        self.log.info("IDtoNidComponents = %s" % self.IDtoNidComponents)
-        self.log.info("Kgg =\n" + print_annotated_matrix(Kgg, self.IDtoNidComponents,
-                                                         self.IDtoNidComponents))
+        if is_info:
+            # these are O(ndofs^2) to format, so skip them unless they're shown
+            self.log.info("IDtoNidComponents = %s" % self.IDtoNidComponents)
+            self.log.info("Kgg =\n" + print_annotated_matrix(Kgg.toarray(), self.IDtoNidComponents,
+                                                             self.IDtoNidComponents))
         #print("Kgg = \n", Kgg)
         #print("iSize = ", i)
 
         #(Kaa, Fa) = self.Partition(Kgg)
         #sys.exit('verify Kgg')
 
-        self.log.info("Kgg/%g = \n%s" % (self.knorm, print_matrix(Kgg / self.knorm)))
-        Kaa, dofs2 = partition_dense_symmetric(Kgg, self.iUs)
-        self.log.info("Kaa/%g = \n%s" % (self.knorm, print_matrix(Kaa / self.knorm)))
+        if is_info:
+            self.log.info("Kgg/%g = \n%s" % (self.knorm, print_matrix(Kgg.toarray() / self.knorm)))
+        Kaa, dofs2 = partition_sparse_symmetric(Kgg, self.iUs)
+        if is_info:
+            self.log.info("Kaa/%g = \n%s" % (self.knorm, print_matrix(Kaa.toarray() / self.knorm)))
         #print("Kaa.shape = ",Kaa.shape)
 
         #sys.exit('verify Kaa')
         Fa, _dofs2 = partition_dense_vector(Fg, self.iUs)
         #print("Kaa = \n%s" % (print_matrix(Kaa)))
 
-        self.log.info("Fg/%g = \n%s" % (self.fnorm, Fg/self.fnorm))
-        self.log.info("Fa/%g = \n%s" % (self.fnorm, Fa/self.fnorm))
+        if is_info:
+            self.log.info("Fg/%g = \n%s" % (self.fnorm, Fg/self.fnorm))
+            self.log.info("Fa/%g = \n%s" % (self.fnorm, Fa/self.fnorm))
         #print("Us = ", self.Us)
 
         #self.Us = array(self.Us, 'float64')  # SPC
@@ -1822,66 +1875,133 @@ class Solver(OP2):
         self.Kaa = Kaa
         self.Fa = Fa
         Ua = self._solve(Kaa, Fa, dofs2)
+        if is_mpc:
+            # don't let a subcase without MPCs reuse this Kaa
+            self._Kaa_lu = None
         #self.Um = Kma*Ua
         self.Ua = Ua
         return Ua
 
+    def solve_sol_103(self, Kgg, Mgg, nmodes=10):
+        """
+        Finds the lowest modes of [Kaa]{x} = lambda [Maa]{x}
+
+        Parameters
+        ----------
+        Kgg : (N, N) matrix
+            the stiffness matrix
+        Mgg : (N, N) matrix
+            the mass matrix
+        nmodes : int; default=10
+            the number of modes to find
+
+        Returns
+        -------
+        Lambda : (nmodes, ) float ndarray
+            the eigenvalues
+        Ua : (na, nmodes) float ndarray
+            the mode shapes in the a-set
+
+        """
+        Kaa, unused_dofs = partition_sparse_symmetric(Kgg, self.iUs)
+        Maa, unused_dofs = partition_sparse_symmetric(Mgg, self.iUs)
+        na = Kaa.shape[0]
+        if nmodes < na - 1:
+            # shift-invert Lanczos about 0.0 only factors Kaa once and
+            # only finds the modes that were requested
+            Lambda, Ua = eigsh(Kaa.tocsc(), k=nmodes, M=Maa.tocsc(),
+                               sigma=0.0, which='LM')
+        else:
+            # ARPACK needs k < n - 1; the full problem is small, so use the
+            # divide and conquer LAPACK driver
+            Lambda, Ua = eigh(Kaa.toarray(), Maa.toarray(), driver='gvd')
+            Lambda = Lambda[:nmodes]
+            Ua = Ua[:, :nmodes]
+        return Lambda, Ua
+
     def element_dof_start(self, elem, nids):
         node_ids = elem.node_ids
-        index0s = searchsorted(nids, node_ids)
+        index0s = np.searchsorted(nids, node_ids)
         index0s *= 6
         return node_ids, index0s
 
+    def _get_dof_indices(self, dofs):
+        """maps the element dofs, which are (nid, component) or DOF ids, to DOF ids"""
+        if isinstance(dofs[0], tuple):
+            # (nid, component) pairs; look them up in the dense ID table
+            nids, components = np.array(dofs, dtype='int32').T
+            return _get_id_dofs(self.ID, nids, components)
+        return np.asarray(dofs, dtype='int32')
+
     def add_stiffness(self, K, dofs, nijv):
-        #print('self.IDtoNidComponents = %s' % self.IDtoNidComponents) # None
-        self.log.debug('self.nidComponentToID')
-        for k, value in sorted(self.nidComponentToID.items()):
-            self.log.debug('  %s : %s' % (k, value))
-        #nidComponentToID
-
-        Kgg = self.Kgg
-        kabs = np.abs(K)
-        #print(type(Kgg))
-        self.log.debug('Ki =\n\n%s' % K)
-
-        for i, dof1 in enumerate(dofs):
-            if isinstance(dof1, tuple):
-                dof1i = self.nidComponentToID[dof1]
-            else:
-                dof1i = dof1
+        """adds the element stiffness matrix to the Kgg COO triplets"""
+        idofs = self._get_dof_indices(dofs)
+        ndofs = len(idofs)
+        self._Kgg_rows.append(np.repeat(idofs, ndofs))
+        self._Kgg_cols.append(np.tile(idofs, ndofs))
+        self._Kgg_values.append(np.asarray(K, dtype='float64').ravel())
+
+    def add_stiffness_matrices(self, K, dofs):
+        """
+        adds a (nelements, n, n) stack of element stiffness matrices
+        with (nelements, n) dofs to the Kgg COO triplets
+        """
+        ndofs = dofs.shape[1]
+        self._Kgg_rows.append(np.repeat(dofs, ndofs, axis=1).ravel())
+        self._Kgg_cols.append(np.tile(dofs, (1, ndofs)).ravel())
+        self._Kgg_values.append(np.asarray(K, dtype='float64').ravel())
 
-            for j, dof2 in enumerate(dofs):
-                if kabs[i, j] > 0.0:
-                    self.log.debug('  i=%s j=%s dof1=%s dof2=%s Ke[i,j]=%s' % (
-                        i, j, dof1, dof2, K[i, j] / self.knorm))
+    def add_mass(self, M, dofs, nijv):
+        """adds the element mass matrix to the Mgg COO triplets"""
+        idofs = self._get_dof_indices(dofs)
+        ndofs = len(idofs)
+        self._Mgg_rows.append(np.repeat(idofs, ndofs))
+        self._Mgg_cols.append(np.tile(idofs, ndofs))
+        self._Mgg_values.append(np.asarray(M, dtype='float64').ravel())
+
+    def build_position_tables(self, model):
+        """
+        Builds the node index -> xyz and node index -> first DOF tables
 
-                    if isinstance(dof2, tuple):
-                        dof2i = self.nidComponentToID[dof2]
-                    else:
-                        dof2i = dof2
-                    #assert isinstance(dof1i, int), dof1i
-                    #assert isinstance(dof2i, int), dof2i
-                    Kgg[dof1i, dof2i] += K[i, j]
-                    #Kgg[dof1i, dof2i] += K[i, j]
-                    #print('Kgg[%s,%s]=%s' % (dof1, dof2, str(Kgg[dof1i, dof2i])) )
-        self.log.info('Kggi =\n%s' % Kgg)
+        The tables are indexed by the position of the node in the sorted
+        ``model.grid.node_id``, which is found with ``get_node_index``.
 
-    def add_mass(self, M, dofs, nijv):
-        Mgg = self.Mgg
-        Mgg_sparse = self.Mgg_sparse
-        for i, dof1 in enumerate(dofs):
-            dof1i = self.nidComponentToID[dof1]
-            for j, dof2 in enumerate(dofs):
-                if abs(M[i, j]) > 0.0:
-                    dof2i = self.nidComponentToID[dof2]
-                    Mgg[dof1i, dof2i] += M[i, j]
-                    Mgg_sparse[dof1i, dof2i] += M[i, j]
+        The tables are cached, so the stiffness and mass assemblers
+        share them.
+
+        Returns
+        -------
+        positions : (nnodes, 3) float ndarray
+            the xyz of the GRIDs
+        index0s : (nnodes, ) int ndarray
+            the DOF of component 1 of the GRIDs
+        """
+        if self._position_tables is not None and self._position_tables[0] is model:
+            return self._position_tables[1:]
+
+        nnodes = model.grid.n
+        positions = np.asarray(model.grid.xyz, dtype='float64')
+        index0s = np.arange(0, 6 * nnodes, 6, dtype='int32')
+        self._position_tables = (model, positions, index0s)
+        return positions, index0s
 
     def assemble_global_stiffness_matrix(self, model, i, Dofs):
-        self.Kgg = zeros((i, i), 'float64')
-        self.log.info("Kgg.shape = %s" % str(self.Kgg.shape))
+        """
+        Builds Kgg from the element stiffness matrices
 
-        #dof_mapper = []
+        Returns
+        -------
+        Kgg : (i, i) csr_matrix
+            the stiffness matrix; duplicate (row, col) terms are summed
+        Kgg_sparse : (i, i) csr_matrix
+            the same as Kgg
+
+        """
+        ndofs = i
+        self._Kgg_rows = []
+        self._Kgg_cols = []
+        self._Kgg_values = []
+        self.log.info("Kgg.shape = %s" % str((ndofs, ndofs)))
 
         nnodes = model.grid.n
         #nspoints = model.spoint.n
@@ -1889,143 +2009,89 @@ class Solver(OP2):
         self.log.info("nnodes = %s" % nnodes)
         #ndofs = 6 * nnodes + nspoints
 
-        i = 0
         nids = model.grid.node_id
-        #nids.sort()
-        self.log.info('nids = %s %s' %(nids, i))
-        #dof_ids = arange(0, 6*nnodes, 6)
-
-        #dofs_0 = [nid=2, 1] -> searchsorted(nids, nid)[0]
-
-        #for nid in sorted(self.nodes.keys()):
-            #nid_dof_mapper[]
+        if _is_info(self.log):
+            self.log.info('nids = %s' % nids)
 
         self.log.info('start calculating xyz_cid0')
-        self.positions = {}
-        index0s = {}
-        for i in range(model.grid.n):
-            nid = model.grid.node_id[i]
-            self.positions[nid] = model.grid.xyz[i]
-            index0s[nid] = 6 * i
+        self.positions, index0s = self.build_position_tables(model)
         self.log.info('end calculating xyz_cid0')
 
-        # spring
-        if model.celas1.n:
-            self.log.info('start calculating Kcelas1')
-            for i in range(model.celas1.n):
-                K, dofs, nijv = model.celas1.get_stiffness_matrix(
-                    i, model, self.positions, index0s)
-                self.log.info("Kcelas1 =\n%s" % K)
-                self.add_stiffness(K, dofs, nijv)
-
-        if model.celas2.n:
-            self.log.info('start calculating Kcelas2')
-            for i in range(model.celas2.n):
-                K, dofs, nijv = model.celas2.get_stiffness_matrix(
-                    i, model, self.positions, index0s)
-                self.add_stiffness(K, dofs, nijv)
-
-        if model.celas3.n:
-            self.log.info('start calculating Kcelas3')
-            for i in range(model.celas3.n):
-                K, dofs, nijv = model.celas3.get_stiffness_matrix(
-                    i, model, self.positions, index0s)
-                self.add_stiffness(K, dofs, nijv)
-
-        if model.celas4.n:
-            self.log.info('start calculating Kcelas4')
-            for i in range(model.celas4.n):
-                K, dofs, nijv = model.celas4.get_stiffness_matrix(
-                    i, model, self.positions, index0s)
-                self.add_stiffness(K, dofs, nijv)
-
-        # conrod
-        if model.conrod.n:
-            self.log.info('start calculating Kconrod')
-            for i in range(model.conrod.n):
-                #self.conrod_stress = {}
-                K, dofs, nijv = model.conrod.get_stiffness_matrix(i, model, self.positions, index0s)
-                self.add_stiffness(K, dofs, nijv)
-
-        # crod
-        if model.crod.n:
-            self.log.info('start calculating Kcrod')
-            for i in range(model.crod.n):
-                K, dofs, nijv = model.crod.get_stiffness_matrix(i, model, self.positions, index0s)
-                self.add_stiffness(K, dofs, nijv)
-
-        # ctube
-        if model.ctube.n:
-            self.log.info('start calculating Kctube')
-            for i in range(model.crod.n):
-                K, dofs, nijv = model.ctube.get_stiffness_matrix(i, model, self.positions, index0s)
-                self.add_stiffness(K, dofs, nijv)
-
-        # shells
-        if model.ctria3.n:
-            for i in range(model.ctria3.n):
-                K, dofs, nijv = model.ctria3.get_stiffness_matrix(
-                    i, model, self.positions, index0s)
-                self.add_stiffness(K, dofs, nijv)
-
-        if model.cquad4.n:
-            for i in range(model.cquad4.n):
-                K, dofs, nijv = model.cquad4.get_stiffness_matrix(
-                    i, model, self.positions, index0s)
-                self.add_stiffness(K, dofs, nijv)
-
-        # solids
-        if model.ctetra4.n:
-            #K, dofs, nijv = model.ctetra4.get_stiffness_matrices(
-            #    model, xyz_cid0, index0s)
-            for i in range(model.ctetra4.n):
-                K, dofs, nijv = model.ctetra4.get_stiffness_matrix(
-                    i, model, self.positions, index0s)
-                self.add_stiffness(K, dofs, nijv)
-
-
-        #Kgg_sparse = coo_matrix((entries, (rows, cols)), shape=(i, i))
-        Kgg_sparse = None
-        Kgg = self.Kgg
-        return Kgg, Kgg_sparse
+        # the springs/rods are done one card type at a time
+        elements = [
+            # springs
+            model.celas1, model.celas2, model.celas3, model.celas4,
+            # rods
+            model.conrod, model.crod, model.ctube,
+            # shells
+            model.cquad4,
+        ]
+        for elem in elements:
+            if elem.n:
+                self.log.info('start calculating K%s' % elem.type.lower())
+                K, dofs = elem.get_stiffness_matrices(model, self.positions, self.ID)
+                self.add_stiffness_matrices(K, dofs)
+
+        elements = [
+            # shells
+            model.ctria3,
+            # solids
+            model.ctetra4,
+        ]
+        for elem in elements:
+            if elem.n:
+                self.log.info('start calculating K%s' % elem.type.lower())
+                for ielem in range(elem.n):
+                    K, dofs, nijv = elem.get_stiffness_matrix(
+                        ielem, model, self.positions, index0s)
+                    self.add_stiffness(K, dofs, nijv)
+
+        Kgg = self._build_sparse_matrix(
+            self._Kgg_rows, self._Kgg_cols, self._Kgg_values, ndofs)
+        del self._Kgg_rows, self._Kgg_cols, self._Kgg_values
+        self.log.debug('Kgg.shape = %s; nnz = %s' % (str(Kgg.shape), Kgg.nnz))
+        self.Kgg = Kgg
+        return Kgg, Kgg
+
+    @staticmethod
+    def _build_sparse_matrix(rows, cols, values, ndofs):
+        """builds a CSR matrix from lists of COO triplets; duplicates are summed"""
+        if rows:
+            rows = np.hstack(rows)
+            cols = np.hstack(cols)
+            values = np.hstack(values)
+        else:
+            rows = cols = np.zeros(0, dtype='int32')
+            values = np.zeros(0, dtype='float64')
+        A = coo_matrix((values, (rows, cols)), shape=(ndofs, ndofs)).tocsr()
+        A.eliminate_zeros()
+        return A
 
     #def assemble_global_damping_matrix(self, model, i, Dofs):
 
     def assemble_global_mass_matrix(self, model, ndofs, Dofs):
-        self.Mgg = zeros((ndofs, ndofs), 'float64')
-        self.Mgg_sparse = dok_matrix((ndofs, ndofs), dtype='float64')
-
-        #dof_mapper = []
+        self._Mgg_rows = []
+        self._Mgg_cols = []
+        self._Mgg_values = []
 
         nnodes = model.grid.n
         #nspoints = model.spoint.n
         assert nnodes > 0, nnodes
 
-        i = 0
-        #nids = model.grid.node_id
-
-        self.positions = {}
-        index0s = {}
-        for i in range(model.grid.n):
-            nid = model.grid.node_id[i]
-            self.positions[nid] = model.grid.xyz[i]
-            index0s[nid] = 6 * i
+        self.positions, index0s = self.build_position_tables(model)
 
         # mass
         conm1 = model.mass.conm1
         for i in range(conm1.n):
             M = conm1.get_mass_matrix(i)
-            i0 = index[conm1.node_id[i]]
+            i0 = index0s[get_node_index(model.grid.node_id, conm1.node_id[i])]
             coord_id = conm1.coord_id[i]
             if coord_id != 0:
                 msg = 'CONM1 doesnt support coord_id != 0 for element %i; coord_id=%i' % (
                     model.conm1.element_id[i], coord_id)
                 raise RuntimeError(msg)
             # CONM1 doesn't consider coord ID
-            self.Mgg[i0:i0+6, i0:i0+6] += M[:, :]
-            for ii1, i01 in arange(i0, i0+6):
-                for ii2, i02 in arange(i0, i0+6):
-                    self.Mgg_sparse[i01, i02] = M[ii1, ii2]
+            self.add_mass(M, range(i0, i0 + 6), None)
         for i in range(model.mass.conm2.n):
             M, dofs, nijv = model.conm1.get_mass_matrix(i, model, self.positions, index0s)
             self.add_mass(M, dofs, nijv)
@@ -2086,9 +2152,15 @@ class Solver(OP2):
         # cpenta15
         # chexa20
 
-        #Mgg_sparse = coo_matrix((entries, (rows, cols)), shape=(i, i))
-        Mgg_sparse = None
-        Mgg = self.Mgg
+        Mgg_sparse = self._build_sparse_matrix(
+            self._Mgg_rows, self._Mgg_cols, self._Mgg_values, ndofs)
+        del self._Mgg_rows, self._Mgg_cols, self._Mgg_values
+
+        # the grid point weight generator and the eigensolver both take
+        # the sparse matrix, so a dense (ndofs, ndofs) copy isn't made
+        Mgg = Mgg_sparse
+        self.Mgg = Mgg
+        self.Mgg_sparse = Mgg_sparse
         self.log.info('returning Mgg')
         return Mgg, Mgg_sparse
 
@@ -2160,70 +2232,71 @@ class Solver(OP2):
         return is_mpc
 
     def build_dof_sets(self):
+        """joins the DOF subsets into the s, l, t, a, ..., v sets"""
         # s = sb + sg
-        self.Us = self.Usb + self.Usg
-        self.iUs = self.iUsb + self.iUsg
+        self.Us = _join_sets(self.Usb, self.Usg, dtype='float64')
+        self.iUs = _join_sets(self.iUsb, self.iUsg)
 
         # l = b + c + lm
-        self.Ul = self.Uc + self.Ulm
-        self.iUl = self.iUc + self.iUlm
+        self.Ul = _join_sets(self.Uc, self.Ulm, dtype='float64')
+        self.iUl = _join_sets(self.iUc, self.iUlm)
 
         # t = l + r
-        self.Ut = self.Ul + self.Ur
-        self.iUt = self.iUl + self.iUr
+        self.Ut = _join_sets(self.Ul, self.Ur, dtype='float64')
+        self.iUt = _join_sets(self.iUl, self.iUr)
 
         # a = t + q
-        self.Ua = self.Ut + self.Uq
-        self.iUa = self.iUt + self.iUq
+        self.Ua = _join_sets(self.Ut, self.Uq, dtype='float64')
+        self.iUa = _join_sets(self.iUt, self.iUq)
 
         # d = a + e
-        self.Ud = self.Ua + self.Ue
-        self.iUd = self.iUa + self.iUe
+        self.Ud = _join_sets(self.Ua, self.Ue, dtype='float64')
+        self.iUd = _join_sets(self.iUa, self.iUe)
 
         # f = a + o
-        self.Uf = self.Ua + self.Uo
-        self.iUf = self.iUa + self.iUo
+        self.Uf = _join_sets(self.Ua, self.Uo, dtype='float64')
+        self.iUf = _join_sets(self.iUa, self.iUo)
 
         # fe = f + e
-        self.Ufe = self.Uf + self.Ue
-        self.iUfe = self.iUf + self.iUe
+        self.Ufe = _join_sets(self.Uf, self.Ue, dtype='float64')
+        self.iUfe = _join_sets(self.iUf, self.iUe)
 
         # n = f + s
-        self.Un = self.Uf + self.Us
-        self.iUn = self.iUf + self.iUs
+        self.Un = _join_sets(self.Uf, self.Us, dtype='float64')
+        self.iUn = _join_sets(self.iUf, self.iUs)
 
         # ne = n + e
-        self.Une = self.Un + self.Ue
-        self.iUne = self.iUn + self.iUe
+        self.Une = _join_sets(self.Un, self.Ue, dtype='float64')
+        self.iUne = _join_sets(self.iUn, self.iUe)
 
         # m = mp + mr
-        self.Um = self.Ump + self.Umr
-        self.iUm = self.iUmp + self.iUmr
-        self.jUm = self.jUmp + self.jUmr
+        self.Um = _join_sets(self.Ump, self.Umr, dtype='float64')
+        self.iUm = _join_sets(self.iUmp, self.iUmr)
+        self.jUm = _join_sets(self.jUmp, self.jUmr)
 
         # g = n + m
-        self.Ug = self.Un + self.Um
-        self.iUg = self.iUn + self.iUm
+        self.Ug = _join_sets(self.Un, self.Um, dtype='float64')
+        self.iUg = _join_sets(self.iUn, self.iUm)
 
         # p = g + e
-        self.Up = self.Ug + self.Ue
-        self.iUp = self.iUg + self.iUe
+        self.Up = _join_sets(self.Ug, self.Ue, dtype='float64')
+        self.iUp = _join_sets(self.iUg, self.iUe)
 
         # ks = k + sa
-        self.Uks = self.Uk + self.Usa
-        self.iUks = self.iUk + self.iUsa
+        self.Uks = _join_sets(self.Uk, self.Usa, dtype='float64')
+        self.iUks = _join_sets(self.iUk, self.iUsa)
 
         # js = j + sa
-        self.Ujs = self.Uj + self.Usa
-        self.iUjs = self.iUj + self.iUsa
+        self.Ujs = _join_sets(self.Uj, self.Usa, dtype='float64')
+        self.iUjs = _join_sets(self.iUj, self.iUsa)
 
         # fr = o + l = f - q - r
-        self.Ufr = self.Uo + self.Ul
-        self.iUfr = self.iUo + self.iUl
+        self.Ufr = _join_sets(self.Uo, self.Ul, dtype='float64')
+        self.iUfr = _join_sets(self.iUo, self.iUl)
 
         # v = o + c + r
-        self.Uv = self.Uo + self.Uc + self.Ur
-        self.iUv = self.iUo + self.iUc + self.iUr
+        self.Uv = _join_sets(self.Uo, self.Uc, self.Ur, dtype='float64')
+        self.iUv = _join_sets(self.iUo, self.iUc, self.iUr)
         return
 
     def write_oload_resultant(self, Fg, xyz_cid0):
@@ -2257,12 +2330,16 @@ class Solver(OP2):
     def assemble_forces(self, model, ndofs, case, Dofs, xyz_cid0):
         """builds loads"""
         self.log.info('assemble forces')
-        Fg = zeros(ndofs, 'float64')
+        Fg = np.zeros(ndofs, 'float64')
         #print(model.loads)
         load_id = model.case_control_deck.get_subcase_parameter(case.id, 'LOAD')[0]
         self.log.info("load_id = %s" % load_id)
-        loads = model.loadcase.resolve(int(load_id))
+        load_id = int(load_id)
+        if load_id not in self._loads:
+            self._loads[load_id] = model.loadcase.resolve(load_id)
+        loads = self._loads[load_id]
 
+        ID = self.ID
         for load in loads:
             self.log.info(load)
             if load.type in ['FORCE', 'MOMENT']:
@@ -2273,16 +2350,11 @@ class Solver(OP2):
                 else:
                     raise NotImplementedError(load.type)
 
-                for i in range(load.n):
-                    nid = load.node_id[i]
-                    x, y, z = load.mag[i] * load.xyz[i]
-
-                    if abs(x) > 0.:
-                        Fg[Dofs[(nid, ni + 1)]] += x
-                    if abs(y) > 0.:
-                        Fg[Dofs[(nid, ni + 2)]] += y
-                    if abs(z) > 0.:
-                        Fg[Dofs[(nid, ni + 3)]] += z
+                # (n, 3) dofs/values; np.add.at sums repeated nodes
+                dofs = _get_id_dofs(ID, load.node_id[:, np.newaxis],
+                                    np.arange(ni + 1, ni + 4))
+                forces = load.mag[:, np.newaxis] * load.xyz
+                np.add.at(Fg, dofs.ravel(), forces.ravel())
             else:
                 raise NotImplementedError(load.type)
         #print('Fg = %s' % Fg)
@@ -2453,6 +2525,37 @@ class Solver(OP2):
                     #op2.write(result.write_op2(Title, Subtitle))
 
 
+def _join_sets(*dof_sets, dtype='int32'):
+    """joins DOF subsets (lists or arrays) into one array"""
+    return np.hstack([np.asarray(dof_set, dtype=dtype) for dof_set in dof_sets])
+
+
+def _get_id_dofs(ID, nids, components):
+    """
+    Looks up the DOF ids of (nid, component) pairs in the
+    (nnodes, 7) ID table; nids and components are broadcast
+    """
+    nids, components = np.broadcast_arrays(nids, components)
+    dofs = ID[get_node_index(ID[:, 0], nids), components]
+    is_missing = dofs < 0
+    if is_missing.any():
+        missing = np.column_stack([nids[is_missing], components[is_missing]])
+        raise KeyError('(nid, component)=%s are not DOFs' % missing.tolist())
+    return dofs
+
+
+def _is_info(log):
+    """
+    Checks if log.info messages are shown, so the expensive ones (e.g.,
+    dense matrix prints) are only formatted when they'll be used
+    """
+    if hasattr(log, 'isEnabledFor'):
+        # logging.Logger
+        return log.isEnabledFor(logging.INFO)
+    # SimpleLogger
+    return log.level in ('debug', 'info')
+
+
 def get_solver_cards():
     cards_to_read = set([
         'PARAM',
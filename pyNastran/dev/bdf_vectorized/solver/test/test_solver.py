@@ -1,10 +1,14 @@
 """tests the pyNastran solver"""
 import os
 import unittest
+
+import numpy as np
+from scipy.sparse import diags
 from cpylog import SimpleLogger
 
 import pyNastran
 from pyNastran.dev.bdf_vectorized.solver.solver import Solver
+from pyNastran.dev.bdf_vectorized.utils import get_node_index
 from pyNastran.utils import print_bad_path
 
 
@@ -12,6 +16,35 @@ PKG_PATH = pyNastran.__path__[0]
 TEST_PATH = os.path.join(PKG_PATH, 'dev', 'bdf_vectorized', 'solver', 'test')
 log = SimpleLogger('warning', encoding='utf8')
 
+
+def run_solver(bdf_filename):
+    """runs a deck and removes the f06"""
+    bdf_base = os.path.splitext(bdf_filename)[0]
+    fargs = {
+        '--k' : 1.0, '--f' : 1.0, '--m' : 1.0,
+        '--debug' : False,
+        'BDFNAME' : bdf_filename,
+        'BDFBASE' : bdf_base,
+    }
+    solver = Solver(fargs, log=log)
+    solver.run_solver()
+    os.remove(bdf_base + '.f06')
+    return solver
+
+
+def get_element_kgg(solver, elements):
+    """assembles Kgg from the one element at a time stiffness matrices"""
+    model = solver.model
+    positions, index0s = solver.build_position_tables(model)
+    Kgg = np.zeros(solver.Kgg.shape)
+    for elem in elements:
+        for i in range(elem.n):
+            K, dofs, nijv = elem.get_stiffness_matrix(i, model, positions, index0s)
+            idofs = solver._get_dof_indices(dofs)
+            Kgg[np.ix_(idofs, idofs)] += K
+    return Kgg
+
+
 class TestSolverSpring(unittest.TestCase):
     """tests the pyNastran solver"""
 
@@ -40,17 +73,74 @@ class TestSolverSpring(unittest.TestCase):
         solver = Solver(fargs, log=log)
         solver.run_solver()
 
-    #def test_crod(self):
-        #"""runs a 1 element CROD problem"""
-        #fargs = {
-            #'--k' : 1.0, '--f' : 1.0, '--m' : 1.0,
-            #'--debug' : False,
-            #'BDFNAME' : os.path.join(test_path, 'crod.bdf'),
-            #'BDFBASE' : 'crod',
-        #}
-        #log = SimpleLogger('warning', encoding='utf8')
-        #solver = Solver(fargs, log=log)
-        #solver.run_solver()
+    def test_celas_components(self):
+        """CELAS1/CELAS2 on components 2 and 5"""
+        solver = run_solver(os.path.join(TEST_PATH, 'celas_components.bdf'))
+        model = solver.model
+        Kgg = solver.Kgg.toarray()
+        Kgg_expected = get_element_kgg(solver, [model.celas1, model.celas2])
+        assert np.allclose(Kgg, Kgg_expected), Kgg - Kgg_expected
+
+        ID = solver.ID
+        i1, i2, i3 = get_node_index(ID[:, 0], [1, 2, 3])
+        assert Kgg[ID[i1, 2], ID[i2, 2]] == -2.
+        assert Kgg[ID[i1, 5], ID[i2, 5]] == -3.
+        assert Kgg[ID[i2, 2], ID[i3, 2]] == -4.
+        assert Kgg[ID[i2, 5], ID[i3, 5]] == -5.
+        assert Kgg[ID[i1, 2], ID[i3, 5]] == -6.
+        assert Kgg[ID[i2, 2], ID[i2, 2]] == 2. + 4.
+
+    def test_celas_large_ids(self):
+        """the DOF tables are sized by the number of nodes, not the largest node id"""
+        solver = run_solver(os.path.join(TEST_PATH, 'celas_components.bdf'))
+        solver_large = run_solver(os.path.join(TEST_PATH, 'celas_large_ids.bdf'))
+        assert solver_large.ID.shape == (3, 7), solver_large.ID.shape
+        assert np.array_equal(solver_large.ID[:, 0], [90000001, 90000002, 90000003])
+        assert np.array_equal(solver_large.ID[:, 1:], solver.ID[:, 1:])
+
+        positions, index0s = solver_large.build_position_tables(solver_large.model)
+        assert positions.shape == (3, 3), positions.shape
+        assert np.array_equal(index0s, [0, 6, 12])
+        assert np.array_equal(solver_large.Kgg.toarray(), solver.Kgg.toarray())
+
+        isubcase = 1
+        assert np.array_equal(solver_large.displacements[isubcase].data,
+                              solver.displacements[isubcase].data)
+
+    def test_celas_mixed(self):
+        """CELAS1 and CELAS2 in one deck are split into their own tables"""
+        solver = run_solver(os.path.join(TEST_PATH, 'celas_mixed.bdf'))
+
+        # u1 = 0; the x displacements of 2, 3, 4
+        Kaa = np.array([
+            [2. + 3., -3., 0.],
+            [-3., 3. + 4., -4.],
+            [0., -4., 4. + 5.],
+        ])
+        u = np.hstack([0., np.linalg.solve(Kaa, [0., 0., 100.])])
+
+        #                       eid: (g1, g2, k, s)
+        celas1 = {10: (1, 2, 2., 0.5), 12: (3, 4, 4., 2.0)}
+        celas2 = {11: (2, 3, 3., 0.25), 13: (1, 4, 5., 1.5)}
+        isubcase = 1
+        results = solver.op2_results
+        for springs, force, stress, strain in [
+                (celas1, results.force.celas1_force, results.stress.celas1_stress,
+                 results.strain.celas1_strain),
+                (celas2, results.force.celas2_force, results.stress.celas2_stress,
+                 results.strain.celas2_strain)]:
+            eids = np.array(sorted(springs))
+            g1, g2, k, s = np.array([springs[eid] for eid in eids]).T
+            du = u[g1.astype('int32') - 1] - u[g2.astype('int32') - 1]
+            for result, expected in [(force[isubcase], k * du),
+                                     (stress[isubcase], k * du * s),
+                                     (strain[isubcase], du * s)]:
+                assert np.array_equal(result.element, eids), result.element
+                assert np.allclose(result.data[0, :, 0], expected), result.data[0, :, 0]
+
+    def test_crod(self):
+        """runs a 1 element CROD problem"""
+        run_solver(os.path.join(TEST_PATH, 'crod.bdf'))
 
     def test_conrod(self):
         """runs a 1 element CONROD problem"""
@@ -76,5 +166,193 @@ class TestSolverSpring(unittest.TestCase):
         solver = Solver(fargs, log=log)
         solver.run_solver()
 
+class TestSolverShell(unittest.TestCase):
+    """tests the pyNastran solver"""
+
+    def test_cquad4_stiffness(self):
+        """the batched CQUAD4 stiffness of skewed, rotated, theta and out of plane quads"""
+        solver = run_solver(os.path.join(TEST_PATH, 'cquad4s.bdf'))
+        model = solver.model
+        cquad4 = model.cquad4
+        positions, index0s = solver.build_position_tables(model)
+        K, dofs = cquad4.get_stiffness_matrices(model, positions, solver.ID)
+        K100, K200, K300, K400 = K
+        assert np.array_equal(cquad4.element_id, [100, 200, 300, 400])
+
+        # the one element at a time version is T12 only and doesn't support theta;
+        # the T3 terms of the xy plane quads are 0
+        i12 = [0, 1, 3, 4, 6, 7, 9, 10]
+        i3 = [2, 5, 8, 11]
+        for i in [0, 1]:
+            Ki, dofsi, unused_nijv = cquad4.get_stiffness_matrix(
+                i, model, positions, index0s)
+            assert np.allclose(K[i][np.ix_(i12, i12)], Ki), cquad4.element_id[i]
+            assert np.array_equal(dofs[i][i12], dofsi), cquad4.element_id[i]
+            assert np.allclose(K[i][i3, :], 0.), cquad4.element_id[i]
+
+        # rotating the quad rotates its stiffness matrix
+        R = np.array([[0.8, -0.6, 0.],
+                      [0.6, 0.8, 0.],
+                      [0., 0., 1.]])
+        T = np.kron(np.eye(4), R)
+        assert np.allclose(K200, T @ K100 @ T.T)
+
+        # out of the xy plane
+        R = np.array([[1., 0., 0.],
+                      [0., 0.8, -0.6],
+                      [0., 0.6, 0.8]])
+        T = np.kron(np.eye(4), R)
+        assert np.allclose(K400, T @ K100 @ T.T)
+
+        # an isotropic material doesn't care about the material angle
+        assert np.allclose(K300, K100)
+        assert np.array_equal(dofs[2], dofs[0])
+
+class TestSolverRod(unittest.TestCase):
+    """tests the pyNastran solver"""
+
+    def test_rod_stiffness(self):
+        """the CONROD/CROD/CTUBE stiffness of a tetrahedron"""
+        solver = run_solver(os.path.join(TEST_PATH, 'rods.bdf'))
+        model = solver.model
+        positions, index0s = solver.build_position_tables(model)
+        for elem in [model.conrod, model.crod, model.ctube]:
+            K, dofs = elem.get_stiffness_matrices(model, positions, solver.ID)
+            for i in range(elem.n):
+                Ki, dofsi, unused_nijv = elem.get_stiffness_matrix(
+                    i, model, positions, index0s)
+                assert np.allclose(K[i], Ki), elem.type
+                assert np.array_equal(dofs[i], dofsi), elem.type
+
+    def test_rod_stress(self):
+        """the CONROD/CROD stress, strain and force of a tetrahedron"""
+        solver = run_solver(os.path.join(TEST_PATH, 'rods.bdf'))
+        model = solver.model
+        positions, index0s = solver.build_position_tables(model)
+        ID = solver.ID
+
+        # a random displacement field, so the torsion isn't 0
+        q = np.random.RandomState(42).uniform(-1., 1., solver.Kgg.shape[0])
+        E = 1.e7
+        G = 4.e6
+        #                 (A, J, c) of each element
+        properties = {
+            'CONROD' : [(2., 3., 0.5), (1., 4., 0.25)],
+            'CROD' : [(1.5, 2.5, 0.5), (1.5, 2.5, 0.5)],
+        }
+        for elem in [model.conrod, model.crod]:
+            (e1, e4,
+             o1, o4,
+             f1, f4) = elem.displacement_stress(model, positions, q, ID)
+            for i, (A, J, c) in enumerate(properties[elem.type]):
+                Ki, dofsi, unused_nijv = elem.get_stiffness_matrix(
+                    i, model, positions, index0s)
+                in1, in2 = get_node_index(model.grid.node_id, elem.node_ids[i, :])
+                unit = positions[in1] - positions[in2]
+                unit /= np.linalg.norm(unit)
+
+                # the end 1 force/moment is along the rod axis
+                fi = Ki @ q[dofsi]
+                axial = unit @ fi[:3]
+                torque = unit @ fi[6:9]
+                assert np.allclose([f1[i], f4[i]], [axial, torque])
+                assert np.allclose([o1[i], o4[i]], [axial / A, torque * c / J])
+                assert np.allclose([e1[i], e4[i]], [axial / (A * E), torque * c / (J * G)])
+
+        # the recovered tables match the element results for the solved displacements
+        isubcase = 1
+        disp = solver.displacements[isubcase]
+        q = np.zeros(solver.Kgg.shape[0])
+        q[ID[get_node_index(ID[:, 0], disp.node_gridtype[:, 0]), 1:]] = disp.data[0, :, :]
+        results = solver.op2_results
+        for elem, force, stress, strain in [
+                (model.conrod, results.force.conrod_force, results.stress.conrod_stress,
+                 results.strain.conrod_strain),
+                (model.crod, results.force.crod_force, results.stress.crod_stress,
+                 results.strain.crod_strain)]:
+            (e1, e4,
+             o1, o4,
+             f1, f4) = elem.displacement_stress(model, positions, q, ID)
+            # the force is [axial, torsion]; the stress/strain is [axial, SMa, torsion, SMt]
+            for result, itorsion, axial, torsion in [(force[isubcase], 1, f1, f4),
+                                                     (stress[isubcase], 2, o1, o4),
+                                                     (strain[isubcase], 2, e1, e4)]:
+                assert np.array_equal(result.element, elem.element_id)
+                assert np.allclose(result.data[0, :, 0], axial, rtol=1e-4), elem.type
+                assert np.allclose(result.data[0, :, itorsion], torsion,
+                                   rtol=1e-4, atol=1e-8), elem.type
+
+class TestSolverMass(unittest.TestCase):
+    """tests the pyNastran grid point weight generator"""
+
+    def test_gpwg(self):
+        """the GPWG of point masses on GRIDs in a mix of frames"""
+        solver = run_solver(os.path.join(TEST_PATH, 'gpwg.bdf'))
+        ID = solver.ID
+
+        # lumped masses on the translational DOFs
+        masses = np.array([2., 3., 5.])
+        xyz_cid0 = np.array([
+            [0., 0., 0.],
+            [10., 3., -2.],
+            [11., 4., 3.],
+        ])
+        mdiag = np.zeros(solver.Kgg.shape[0])
+        inodes = get_node_index(ID[:, 0], [1, 2, 3])
+        for inode, mass in zip(inodes, masses):
+            mdiag[ID[inode, 1:4]] = mass
+        Mgg = diags([mdiag], [0], format='csr')
+
+        mass_total = masses.sum()
+        cg = masses @ xyz_cid0 / mass_total
+        for grid_point, ref_point in [(0, np.zeros(3)), (2, xyz_cid0[1])]:
+            solver.make_gpwg(grid_point, Mgg)
+            weight = solver.grid_point_weight['']
+            assert weight.reference_point == grid_point
+
+            assert np.allclose(weight.mass, mass_total), weight.mass
+            # the cg is relative to the reference point; each row is a mass
+            # direction, which doesn't locate the cg along itself
+            cg_expected = (cg - ref_point) * (1. - np.eye(3))
+            assert np.allclose(weight.cg, cg_expected), weight.cg
+
+            dxyz = xyz_cid0 - ref_point
+            inertia = np.einsum('i,ij,ik->jk', masses, dxyz, dxyz)
+            inertia_expected = np.trace(inertia) * np.eye(3) - inertia
+            assert np.allclose(weight.MO[:3, :3], mass_total * np.eye(3)), weight.MO
+            assert np.allclose(weight.MO[3:, 3:], inertia_expected), weight.MO
+
+class TestSolverModes(unittest.TestCase):
+    """tests the pyNastran eigensolver"""
+
+    def test_spring_chain_modes(self):
+        """the modes of a fixed-free chain of springs and masses"""
+        fargs = {'--k' : 1.0, '--f' : 1.0, '--m' : 1.0, '--debug' : False}
+        solver = Solver(fargs, log=log)
+
+        # DOF 0 is grounded; DOFs 1-n are masses joined by springs
+        n = 20
+        k = 3.
+        m = 2.
+        kdiag = np.full(n + 1, 2 * k)
+        kdiag[[0, -1]] = k
+        Kgg = diags([kdiag, np.full(n, -k), np.full(n, -k)], [0, -1, 1], format='csr')
+        Mgg = diags([np.full(n + 1, m)], [0], format='csr')
+        solver.iUs = [0]
+
+        j = np.arange(1, n + 1)
+        lambda_expected = 4 * k / m * np.sin((2 * j - 1) * np.pi / (2 * (2 * n + 1))) ** 2
+        Kaa = Kgg.toarray()[1:, 1:]
+        Maa = Mgg.toarray()[1:, 1:]
+
+        # the few lowest modes use the shift-invert Lanczos solver and
+        # all the modes use the dense solver
+        for nmodes in [3, n]:
+            Lambda, Ua = solver.solve_sol_103(Kgg, Mgg, nmodes=nmodes)
+            assert Ua.shape == (n, nmodes), Ua.shape
+            isort = np.argsort(Lambda)
+            assert np.allclose(Lambda[isort], lambda_expected[:nmodes])
+            assert np.allclose(Kaa @ Ua, Maa @ Ua * Lambda)
+
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
@@ -1,4 +1,6 @@
+import numpy as np
 from numpy import ndarray, zeros
+from scipy.sparse import csr_matrix
 
 def partition_sparse(Is, Js, Vs):
     I2 = []
@@ -13,26 +15,33 @@ def partition_sparse(Is, Js, Vs):
 
 
 def get_dof_set(nall, dofs):
-    dofs_all = {i for i in range(nall)}
-    dofs = list(dofs_all.difference(set(dofs)))
-    return dofs
+    """gets the sorted dofs in range(nall) that aren't in dofs"""
+    is_kept = np.ones(nall, dtype='bool')
+    is_kept[np.asarray(dofs, dtype='int32')] = False
+    return np.flatnonzero(is_kept)
 
 def remove_dofs(dofs_all, dofs_remove):
-    dofs = list(dofs_all.difference(set(dofs_remove)))
+    dofs = np.setdiff1d(np.asarray(list(dofs_all), dtype='int32'),
+                        np.asarray(dofs_remove, dtype='int32'))
     return dofs
 
 
 def partition_dense_symmetric(A, dofs_in):
     nall = A.shape[0]
     dofs = get_dof_set(nall, dofs_in)
-    dofs.sort()
-    n = len(dofs)
-    A2 = zeros((n, n), 'float64')
-    for (i, dofI) in enumerate(dofs):
-        for (j, dofJ) in enumerate(dofs):
-            v = A[dofI, dofJ]
-            if abs(v) >= 1e-8:
-                A2[i, j] = v
+    A2 = np.array(A[np.ix_(dofs, dofs)], dtype='float64')
+    A2[abs(A2) < 1e-8] = 0.
+    return (A2, dofs)
+
+
+def partition_sparse_symmetric(A, dofs_in):
+    """same as partition_dense_symmetric, but for a scipy.sparse matrix"""
+    nall = A.shape[0]
+    dofs = get_dof_set(nall, dofs_in)
+    # row slice on CSR, column slice on CSC
+    A2 = csr_matrix(A)[dofs, :].tocsc()[:, dofs]
+    A2.data[abs(A2.data) < 1e-8] = 0.
+    A2.eliminate_zeros()
     return (A2, dofs)
 
 
@@ -40,14 +49,9 @@ def partition_dense_vector(F, dofs_in):
     nall = F.shape[0]
     #print("partition_dense_vector:  dofs_in = %s" % sorted(dofs_in))
     dofs = get_dof_set(nall, dofs_in)
-    dofs.sort()
     #print("partition_dense_vector:  dofs = %s" % dofs)
-    n = len(dofs)
-    F2 = zeros(n, 'float64')
-    for (i, dofI) in enumerate(dofs):
-        v = F[dofI]
-        if abs(v) >= 1e-8:
-            F2[i] = v
+    F2 = np.array(F[dofs], dtype='float64')
+    F2[abs(F2) < 1e-8] = 0.
     return (F2, dofs)
 
 
@@ -1,4 +1,4 @@
-from numpy import array, ndarray
+from numpy import array, ndarray, asarray, searchsorted, minimum, unique
 #from pyNastran.femutils.utils import unique2d
 
 def slice_to_iter(ids):
@@ -48,3 +48,35 @@ def slice_to_iter(ids):
     else:
         raise KeyError(ids)
     return ids2, int_flag
+
+
+def get_node_index(node_ids, nids):
+    """
+    Gets the index of each node id in a sorted array of node ids
+
+    Parameters
+    ----------
+    node_ids : (nnodes, ) int ndarray
+        the sorted node ids (e.g., model.grid.node_id)
+    nids : int / int ndarray
+        the node ids to find; any shape
+
+    Returns
+    -------
+    inids : int ndarray
+        node_ids[inids] = nids; the same shape as nids
+
+    Raises
+    ------
+    KeyError : a node id isn't in node_ids
+    """
+    nids = asarray(nids)
+    inids = searchsorted(node_ids, nids)
+    if len(node_ids):
+        # ids past the end are placed at len(node_ids)
+        is_missing = node_ids[minimum(inids, len(node_ids) - 1)] != nids
+    else:
+        is_missing = inids >= 0
+    if is_missing.any():
+        raise KeyError('node_ids=%s are not defined' % unique(nids[is_missing]).tolist())
+    return inids
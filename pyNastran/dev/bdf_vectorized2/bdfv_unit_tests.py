@@ -1,12 +1,13 @@
 """tests the vectorized BDF class before being used by the GUI"""
 import os
 import unittest
+from io import StringIO
 import numpy as np
 
 from cpylog import SimpleLogger
 import pyNastran
 from pyNastran.bdf.bdf import read_bdf
-from pyNastran.dev.bdf_vectorized2.bdf_vectorized import read_bdf as read_bdfv
+from pyNastran.dev.bdf_vectorized2.bdf_vectorized import BDF as BDFv, read_bdf as read_bdfv
 
 PKG_PATH = pyNastran.__path__[0]
 MODEL_PATH = os.path.join(PKG_PATH, '..', 'models')
@@ -172,6 +173,40 @@ class TestVectorized(unittest.TestCase):
                         close=True)
         os.remove(out_filename)
 
+    def test_shells_make_current(self):
+        """adds shells to elements that were already made current"""
+        model = BDFv(log=SimpleLogger(level='warning'))
+        cquad4 = model.cquad4
+        cquad4.add(20, 2, [5, 6, 7, 8], thickness=[1., 1., 1., 1.])
+        cquad4.make_current()
+        cquad4.add(10, 1, [1, 2, 3, 4], theta_mcid=3, thickness=[0.1, 0.2, 0.3, 0.4])
+        cquad4.make_current()
+        assert np.array_equal(cquad4.pid, [1, 2]), cquad4.pid
+        assert cquad4.nids.shape == (2, 4), cquad4.nids.shape
+        assert cquad4.thickness.shape == (2, 4), cquad4.thickness.shape
+
+        msg = cquad4.write_card(bdf_file=StringIO())
+        assert [line.rstrip() for line in msg.splitlines()] == [
+            'CQUAD4        10       1       1       2       3       4       3',
+            '                              .1      .2      .3      .4',
+            'CQUAD4        20       2       5       6       7       8',
+            '                              1.      1.      1.      1.',
+        ], msg
+
+        cquad = model.cquad
+        cquad.add(40, 2, [5, 6, 7, 8, 9, None, None, None, None])
+        cquad.make_current()
+        cquad.add(30, 1, [1, 2, 3, 4, None, None, None, None, 11], theta_mcid=3)
+        cquad.make_current()
+        assert cquad.nids.shape == (2, 9), cquad.nids.shape
+
+        msg = cquad.write_card(bdf_file=StringIO())
+        assert msg == (
+            'CQUAD         30       1       1       2       3       4       0       0\n'
+            '               0       0      11       3\n'
+            'CQUAD         40       2       5       6       7       8       9       0\n'
+            '               0       0       0     0.0\n'), msg
+
 
 if __name__ == '__main__':  # pragma: no cover
     unittest.main()
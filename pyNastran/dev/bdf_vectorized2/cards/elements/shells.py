@@ -46,10 +46,8 @@ class ShellElement:
 
     @property
     def is_theta(self):
-        is_theta = np.full(len(self.eid), False, dtype='bool', order='C')
-        i = np.where(self.mcid == -1)[0]
-        is_theta[i] = True
-        return is_theta
+        """is the material orientation a theta (mcid=-1) or an mcid?"""
+        return self.mcid == -1
 
     def check_if_current(self, nid, nids):
         """we split this up to reason about it easier"""
@@ -71,28 +69,37 @@ class ShellElement:
     def make_current(self):
         """creates an array of the GRID points"""
         if not self.is_current:
+            # convert the pending cards once, so we don't have to go through
+            # the slow list -> array conversion of np.hstack/np.vstack
+            eid = np.array(self._eid, dtype='int32')
+            pid = np.array(self._pid, dtype='int32')
+            nids = np.array(self._nids, dtype='int32')
+            theta = np.array(self._theta, dtype='float64')
+            mcid = np.array(self._mcid, dtype='int32')
+            thickness = np.array(self._thickness, dtype='float64')
+            thickness_flag = np.array(self._thickness_flag, dtype='int32')
+            zoffset = np.array(self._zoffset, dtype='float64')
+            #self.ps = np.array(self._ps)
+            #self.seid = np.array(self._seid)
             if len(self.eid) > 0: # there are already elements in self.eid
-                self.eid = np.hstack([self.eid, self._eid])
-                self.pid = np.vstack([self.pid, self._pid])
-                self.nids = np.hstack([self.nids, self._nids])
-                self.theta = np.hstack([self.theta, self._theta])
-                self.mcid = np.hstack([self.mcid, self._mcid])
-                self.thickness = np.vstack([self.thickness, self._thickness])
-                self.thickness_flag = np.hstack([self.thickness_flag, self._thickness_flag])
-                self.zoffset = np.hstack([self.zoffset, self._zoffset])
-                #self.seid = np.hstack(self.seid, self._seid)
+                eid = np.concatenate((self.eid, eid))
+                pid = np.concatenate((self.pid, pid))
+                nids = np.vstack((self.nids, nids))
+                theta = np.concatenate((self.theta, theta))
+                mcid = np.concatenate((self.mcid, mcid))
+                thickness = np.vstack((self.thickness, thickness))
+                thickness_flag = np.concatenate((self.thickness_flag, thickness_flag))
+                zoffset = np.concatenate((self.zoffset, zoffset))
+                #seid = np.concatenate((self.seid, seid))
                 # don't need to handle comments
-            else:
-                self.eid = np.array(self._eid, dtype='int32')
-                self.pid = np.array(self._pid, dtype='int32')
-                self.nids = np.array(self._nids, dtype='int32')
-                self.theta = np.array(self._theta, dtype='float64')
-                self.mcid = np.array(self._mcid, dtype='int32')
-                self.thickness = np.array(self._thickness, dtype='float64')
-                self.thickness_flag = np.array(self._thickness_flag, dtype='int32')
-                self.zoffset = np.array(self._zoffset, dtype='float64')
-                #self.ps = np.array(self._ps)
-                #self.seid = np.array(self._seid)
+            self.eid = eid
+            self.pid = pid
+            self.nids = nids
+            self.theta = theta
+            self.mcid = mcid
+            self.thickness = thickness
+            self.thickness_flag = thickness_flag
+            self.zoffset = zoffset
             assert len(self.eid) == len(np.unique(self.eid))
 
             isort = np.argsort(self.eid)
@@ -117,6 +124,18 @@ class ShellElement:
             #self._cd = []
             self.is_current = True
 
+    def _write_rows(self, row1, row2):
+        """
+        Joins the per-element first/second lines of the cards and their
+        comments into a single string; blank trailing fields are stripped
+        """
+        cards = [(row1i + '\n' + row2i).rstrip()
+                 for row1i, row2i in zip(row1.tolist(), row2.tolist())]
+        if self.comment:
+            cards = [self.comment.get(eid, '') + card
+                     for eid, card in zip(self.eid.tolist(), cards)]
+        return '\n'.join(cards) + '\n'
+
     def cross_reference(self, model: BDF) -> None:
         """does this do anything?"""
         self.make_current()
@@ -271,26 +290,28 @@ class CTRIA3v(ShellElement):
     def write_card(self, size=8, is_double=False, bdf_file=None):
         assert bdf_file is not None
         self.make_current()
-        msg = ''
-        for eid, pid, nids, theta, mcid, thickness_flag, thickness in zip(
-            self.eid, self.pid, self.nids, self.theta, self.mcid, self.thickness_flag, self.thickness):
-            #zoffset = set_blank_if_default(self.zoffset, 0.0)
-            thickness_flag = set_blank_if_default(thickness_flag, 0)
-            #theta_mcid = set_blank_if_default(self.Theta_mcid(), 0.0)
-            zoffset = 0.
-            #T1 = set_blank_if_default(self.T1, 1.0)
-            #T2 = set_blank_if_default(self.T2, 1.0)
-            #T3 = set_blank_if_default(self.T3, 1.0)
-
-            if mcid != -1:
-                theta = mcid
-            row2_data = [theta, zoffset, # theta is theta_mcid
-                         thickness_flag] + thickness.tolist()
-            row2 = [print_field_8(field) for field in row2_data]
-            data = [eid, pid] + nids.tolist() + row2
-            msgi = ('CTRIA3  %8i%8i%8i%8i%8i%8s%8s\n'
-                    '                %8s%8s%8s%8s\n' % tuple(data))
-            msg += self.comment[eid] + msgi.rstrip() + '\n'
+        if len(self.eid) == 0:
+            return ''
+        #zoffset = set_blank_if_default(self.zoffset, 0.0)
+        zoffset = print_field_8(0.)
+        #theta_mcid = set_blank_if_default(self.Theta_mcid(), 0.0)
+        theta_mcid = np.where(self.mcid != -1,
+                              print_fields_8(self.mcid),
+                              print_fields_8(self.theta))
+        thickness_flag = print_fields_8(self.thickness_flag, default=0)
+        #T1 = set_blank_if_default(self.T1, 1.0)
+        #T2 = set_blank_if_default(self.T2, 1.0)
+        #T3 = set_blank_if_default(self.T3, 1.0)
+        thickness = print_fields_8(self.thickness)
+        nids = print_fields_8(self.nids)
+
+        row1 = join_fields(
+            'CTRIA3  ', print_fields_8(self.eid), print_fields_8(self.pid),
+            nids[:, 0], nids[:, 1], nids[:, 2], theta_mcid, zoffset)
+        row2 = join_fields(
+            '        ', '        ', thickness_flag,
+            thickness[:, 0], thickness[:, 1], thickness[:, 2])
+        msg = self._write_rows(row1, row2)
         bdf_file.write(msg)
         return msg
 
@@ -501,24 +522,22 @@ class CTRIA6v(ShellElement):
     def write_card(self, size=8, is_double=False, bdf_file=None):
         assert bdf_file is not None
         self.make_current()
-        msg = ''
+        #zoffset = set_blank_if_default(self.zoffset, 0.0)
+        zoffset = 0.
+        msgs = []
         for eid, pid, nids, theta, mcid, thickness_flag, thickness in zip(
             self.eid, self.pid, self.nids, self.theta, self.mcid, self.thickness_flag, self.thickness):
-            #zoffset = set_blank_if_default(self.zoffset, 0.0)
             thickness_flag = set_blank_if_default(thickness_flag, 0)
             #theta_mcid = set_blank_if_default(self.Theta_mcid(), 0.0)
             if mcid == -1:
                 mcid = theta # theta_mcid
-            zoffset = 0.
             #T1 = set_blank_if_default(self.T1, 1.0)
             #T2 = set_blank_if_default(self.T2, 1.0)
             #T3 = set_blank_if_default(self.T3, 1.0)
-
-            if mcid != -1:
-                theta = mcid
             list_fields = (['CTRIA6', eid, pid] + nids.tolist() +
                            [mcid, zoffset] + thickness.tolist() + [thickness_flag])
-            msg += self.comment[eid] + print_card_8(list_fields)
+            msgs.append(self.comment[eid] + print_card_8(list_fields))
+        msg = ''.join(msgs)
         bdf_file.write(msg)
         return msg
 
@@ -621,24 +640,22 @@ class CTRIARv(ShellElement):
     def write_card(self, size=8, is_double=False, bdf_file=None):
         assert bdf_file is not None
         self.make_current()
-        msg = ''
+        #zoffset = set_blank_if_default(self.zoffset, 0.0)
+        zoffset = 0.
+        msgs = []
         for eid, pid, nids, theta, mcid, thickness_flag, thickness in zip(
             self.eid, self.pid, self.nids, self.theta, self.mcid, self.thickness_flag, self.thickness):
-            #zoffset = set_blank_if_default(self.zoffset, 0.0)
             thickness_flag = set_blank_if_default(thickness_flag, 0)
             #theta_mcid = set_blank_if_default(self.Theta_mcid(), 0.0)
             if mcid == -1:
                 mcid = theta # theta_mcid
-            zoffset = 0.
             #T1 = set_blank_if_default(self.T1, 1.0)
             #T2 = set_blank_if_default(self.T2, 1.0)
             #T3 = set_blank_if_default(self.T3, 1.0)
-
-            if mcid != -1:
-                theta = mcid
             list_fields = (['CTRIAR', eid, pid] + nids.tolist() +
                            [mcid, zoffset, None, None, thickness_flag] + thickness.tolist())
-            msg += self.comment[eid] + print_card_8(list_fields)
+            msgs.append(self.comment[eid] + print_card_8(list_fields))
+        msg = ''.join(msgs)
         bdf_file.write(msg)
         return msg
 
@@ -784,37 +801,28 @@ class CQUAD4v(ShellElement):
     def write_card(self, size=8, is_double=False, bdf_file=None):
         assert bdf_file is not None
         self.make_current()
-        msg = ''
-        for eid, pid, nids, theta, mcid, zoffset, thickness_flag, thickness in zip(
-            self.eid, self.pid, self.nids, self.theta, self.mcid, self.zoffset,
-            self.thickness_flag, self.thickness):
-
-            theta_mcid = mcid
-            if mcid == -1:
-                theta_mcid = theta
-
-            row2_data = [theta_mcid, zoffset,
-                         thickness_flag] + thickness.tolist()
-
-            #if row2_data == [0.0, 0.0, 0, 1.0, 1.0, 1.0, 1.0]:
-            if row2_data == [0.0, 0.0, 0, np.nan, np.nan, np.nan, np.nan]:
-                data = [eid, pid] + nids.tolist()
-                msgi = ('CQUAD4  %8i%8i%8i%8i%8i%8i\n' % tuple(data))
-            else:
-                theta_mcid = set_blank_if_default(theta_mcid, 0.0)
-                zoffset = set_blank_if_default(zoffset, 0.0)
-                thickness_flag = set_blank_if_default(thickness_flag, 0)
-                row2_data = [theta_mcid, zoffset,
-                             thickness_flag] + thickness.tolist()
-                #T1 = set_blank_if_default(self.T1, 1.0)
-                #T2 = set_blank_if_default(self.T2, 1.0)
-                #T3 = set_blank_if_default(self.T3, 1.0)
-                #T4 = set_blank_if_default(self.T4, 1.0)
-                row2 = [print_field_8(field) for field in row2_data]
-                data = [eid, pid] + nids.tolist() + row2
-                msgi = ('CQUAD4  %8i%8i%8i%8i%8i%8i%8s%8s\n'
-                        '                %8s%8s%8s%8s%8s\n' % tuple(data))
-            msg += self.comment[eid] + msgi.rstrip() + '\n'
+        if len(self.eid) == 0:
+            return ''
+        # blank fields are stripped off, so the default card is one line
+        theta_mcid = np.where(self.mcid != -1,
+                              print_fields_8(self.mcid, default=0.0),
+                              print_fields_8(self.theta, default=0.0))
+        zoffset = print_fields_8(self.zoffset, default=0.0)
+        thickness_flag = print_fields_8(self.thickness_flag, default=0)
+        #T1 = set_blank_if_default(self.T1, 1.0)
+        #T2 = set_blank_if_default(self.T2, 1.0)
+        #T3 = set_blank_if_default(self.T3, 1.0)
+        #T4 = set_blank_if_default(self.T4, 1.0)
+        thickness = print_fields_8(self.thickness)
+        nids = print_fields_8(self.nids)
+
+        row1 = join_fields(
+            'CQUAD4  ', print_fields_8(self.eid), print_fields_8(self.pid),
+            nids[:, 0], nids[:, 1], nids[:, 2], nids[:, 3], theta_mcid, zoffset)
+        row2 = join_fields(
+            '        ', '        ', thickness_flag,
+            thickness[:, 0], thickness[:, 1], thickness[:, 2], thickness[:, 3])
+        msg = self._write_rows(row1, row2)
         bdf_file.write(msg)
         return msg
 
@@ -964,27 +972,25 @@ class CQUAD8v(ShellElement):
     def write_card(self, size=8, is_double=False, bdf_file=None):
         assert bdf_file is not None
         self.make_current()
-        msg = ''
+        #zoffset = set_blank_if_default(self.zoffset, 0.0)
+        zoffset = 0.
+        msgs = []
         for eid, pid, nids, theta, mcid, thickness_flag, thickness in zip(
             self.eid, self.pid, self.nids, self.theta, self.mcid, self.thickness_flag, self.thickness):
-            #zoffset = set_blank_if_default(self.zoffset, 0.0)
             thickness_flag = set_blank_if_default(thickness_flag, 0)
             #theta_mcid = set_blank_if_default(self.Theta_mcid(), 0.0)
 
             if mcid == -1:
                 mcid = theta # theta_mcid
-            zoffset = 0.
             #T1 = set_blank_if_default(self.T1, 1.0)
             #T2 = set_blank_if_default(self.T2, 1.0)
             #T3 = set_blank_if_default(self.T3, 1.0)
             #T4 = set_blank_if_default(self.T4, 1.0)
 
-            if mcid != -1:
-                theta = mcid
-
             list_fields = (['CQUAD8', eid, pid] + nids.tolist() + thickness.tolist() + [
                 mcid, zoffset, thickness_flag])
-            msg += self.comment[eid] + print_card_8(list_fields)
+            msgs.append(self.comment[eid] + print_card_8(list_fields))
+        msg = ''.join(msgs)
         bdf_file.write(msg)
         return msg
 
@@ -1086,19 +1092,23 @@ class CQUADv(ShellElement):
     def make_current(self):
         """creates an array of the GRID points"""
         if not self.is_current:
+            eid = np.array(self._eid, dtype='int32')
+            pid = np.array(self._pid, dtype='int32')
+            nids = positive_int_array(self._nids, dtype='int32')
+            theta = np.array(self._theta, dtype='float64')
+            mcid = np.array(self._mcid, dtype='int32')
             if len(self.eid) > 0: # there are already elements in self.eid
-                self.eid = np.hstack([self.eid, self._eid])
-                self.pid = np.vstack([self.pid, self._pid])
-                self.nids = np.hstack([self.nids, self._nids])
-                self.theta = np.hstack([self.theta, self._theta])
-                self.mcid = np.hstack([self.mcid, self._mcid])
+                eid = np.concatenate((self.eid, eid))
+                pid = np.concatenate((self.pid, pid))
+                nids = np.vstack((self.nids, nids))
+                theta = np.concatenate((self.theta, theta))
+                mcid = np.concatenate((self.mcid, mcid))
                 # don't need to handle comments
-            else:
-                self.eid = np.array(self._eid, dtype='int32')
-                self.pid = np.array(self._pid, dtype='int32')
-                self.nids = positive_int_array(self._nids, dtype='int32')
-                self.theta = np.array(self._theta, dtype='float64')
-                self.mcid = np.array(self._mcid, dtype='int32')
+            self.eid = eid
+            self.pid = pid
+            self.nids = nids
+            self.theta = theta
+            self.mcid = mcid
             assert len(self.eid) == len(np.unique(self.eid))
 
             isort = np.argsort(self.eid)
@@ -1159,17 +1169,19 @@ class CQUADv(ShellElement):
     def write_card(self, size=8, is_double=False, bdf_file=None):
         assert bdf_file is not None
         self.make_current()
-        msg = ''
+        msgs = []
         for eid, pid, nids, theta, mcid in zip(
-            self.eid, self.pid, self.nids, self.theta, self.mcid):
-            nodes2 = ['' if node is None else '%8i' % node for node in nids[4:].tolist()]
+            self.eid.tolist(), self.pid.tolist(), self.nids.tolist(),
+            self.theta.tolist(), self.mcid.tolist()):
+            # missing nodes are 0 (see positive_int_array)
+            n1, n2, n3, n4, n5, n6, n7, n8, n9 = nids
             if mcid == -1:
                 mcid = theta
 
-            data = [eid, pid] + nids[:4].tolist() + nodes2 + [mcid]
-            msgi = ('CQUAD   %8i%8i%8i%8i%8i%8i%8s%8s\n'  # 6 nodes
-                    '        %8s%8s%8s%8s\n' % tuple(data))
-            msg += self.comment[eid] + msgi.rstrip() + '\n'
+            msgi = (f'CQUAD   {eid:8d}{pid:8d}{n1:8d}{n2:8d}{n3:8d}{n4:8d}{n5:8d}{n6:8d}\n'
+                    f'        {n7:8d}{n8:8d}{n9:8d}{mcid!s:>8}\n')
+            msgs.append(self.comment[eid] + msgi.rstrip() + '\n')
+        msg = ''.join(msgs)
         bdf_file.write(msg)
         return msg
 
@@ -1310,27 +1322,25 @@ class CQUADRv(ShellElement):
     def write_card(self, size=8, is_double=False, bdf_file=None):
         assert bdf_file is not None
         self.make_current()
-        msg = ''
+        #zoffset = set_blank_if_default(self.zoffset, 0.0)
+        zoffset = 0.
+        msgs = []
         for eid, pid, nids, theta, mcid, thickness_flag, thickness in zip(
             self.eid, self.pid, self.nids, self.theta, self.mcid, self.thickness_flag, self.thickness):
-            #zoffset = set_blank_if_default(self.zoffset, 0.0)
             thickness_flag = set_blank_if_default(thickness_flag, 0)
             #theta_mcid = set_blank_if_default(self.Theta_mcid(), 0.0)
 
             if mcid == -1:
                 mcid = theta # theta_mcid
-            zoffset = 0.
             #T1 = set_blank_if_default(self.T1, 1.0)
             #T2 = set_blank_if_default(self.T2, 1.0)
             #T3 = set_blank_if_default(self.T3, 1.0)
             #T4 = set_blank_if_default(self.T4, 1.0)
 
-            if mcid != -1:
-                theta = mcid
-
             list_fields = (['CQUAD8', eid, pid] + nids.tolist() + thickness.tolist() + [
                 mcid, zoffset, thickness_flag])
-            msg += self.comment[eid] + print_card_8(list_fields)
+            msgs.append(self.comment[eid] + print_card_8(list_fields))
+        msg = ''.join(msgs)
         bdf_file.write(msg)
         return msg
 
@@ -1426,3 +1436,44 @@ def positive_int_array(array_, dtype='int32'):
         #i0 = np.where(new_array < 0)
         #new_array[i0] = 0
     return new_array
+
+
+def print_fields_8(values, default=None):
+    """
+    Prints an array of values as 8-character width fields
+
+    Each unique value is only passed through ``print_field_8`` once,
+    which is the expensive part of writing a large model.
+
+    Parameters
+    ----------
+    values : (n, ...) int/float ndarray
+        the values to print
+    default : int/float; default=None
+        values equal to the default are left blank
+        (see ``set_blank_if_default``)
+
+    Returns
+    -------
+    fields : (n, ...) str ndarray
+        the 8-character fields
+
+    """
+    values = np.asarray(values)
+    uvalues, inverse = np.unique(values, return_inverse=True)
+    ufields = np.array([print_field_8(set_blank_if_default(value, default))
+                        for value in uvalues], dtype='<U8')
+    return ufields[inverse].reshape(values.shape)
+
+
+def join_fields(*fields):
+    """
+    Concatenates columns of 8-character fields (or 8-character constants)
+    into one string per row
+
+    The (n, nfields) '<U8' block is reinterpreted as n strings of
+    8 * nfields characters, so there is no per-row string concatenation.
+    """
+    columns = np.broadcast_arrays(*[np.asarray(field, dtype='<U8') for field in fields])
+    block = np.ascontiguousarray(np.column_stack(columns))
+    return block.view('<U%i' % (8 * len(fields)))[:, 0]